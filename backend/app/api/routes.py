@@ -1,10 +1,25 @@
 """
 API routes for the weather application
 """
-from fastapi import APIRouter
-from app.models.weather import RootResponse, ServerStatus
+import time
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from app.models.weather import RootResponse, ServerStatus, WeatherData, StationDistance, ForecastResponse
+from app.models.city import CityInfo, CityCreate, CityUpdate
 from app.services.websocket_manager import websocket_manager
 from app.services.robot_service import robot_service
+from app.services.weather_cache import weather_cache, geo_weather_cache
+from app.services.weather_service import WeatherService
+from app.services.station_index import station_index
+from app.services.forecast_store import forecast_store
+from app.services.city_registry import city_registry
+from app.services.circuit_breaker import circuit_breakers
+from app.services.change_detector import change_detector
+from app.services.leader_election import leader_election
+from app.services.weather_snapshot import weather_snapshot
+from app.services.providers.registry import provider_registry
+from app.services.broker import broker
 from app.core.settings import settings
 from app.utils.helpers import get_colombia_time
 
@@ -30,5 +45,112 @@ async def get_status():
         timestamp=get_colombia_time().isoformat(),
         observers_connected=websocket_manager.get_observer_count(),
         robot_tasks=robot_service.get_running_robots(),
-        uptime="running"
+        uptime="running",
+        weather_cache=weather_cache.get_stats(),
+        circuit_breakers=circuit_breakers.get_stats(),
+        weather_providers=provider_registry.get_stats(),
+        upstream_quota=provider_registry.get_quota_stats(),
+        geo_cache=geo_weather_cache.get_stats(),
+        station_index=station_index.get_stats(),
+        forecast_store=forecast_store.get_stats(),
+        robot_intervals=robot_service.get_intervals(),
+        broadcasts=change_detector.get_stats(),
+        robot_leader=leader_election.get_stats(),
+        weather_snapshot=weather_snapshot.get_stats(),
+        observer_fanout=websocket_manager.get_stats(),
+        broker=broker.get_stats()
+    )
+
+@router.get("/weather/at", response_model=WeatherData)
+async def get_weather_at(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude")
+):
+    """Get weather for arbitrary coordinates (cached per geohash bucket)"""
+    return await WeatherService.get_weather_at(lat, lon)
+
+
+@router.get("/forecast/{city}", response_model=ForecastResponse)
+async def get_forecast(city: str, hours: int = Query(24, ge=1, le=120, description="Hourly points to return")):
+    """Get the cached hourly and daily forecast for a city"""
+    forecast = await WeatherService.get_forecast(city)
+    if forecast is None:
+        raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+    
+    return ForecastResponse(
+        city=city,
+        name=settings.CITIES[city]["name"],
+        source=forecast.source,
+        fetched_at=datetime.fromtimestamp(forecast.fetched_at, get_colombia_time().tzinfo).isoformat(),
+        stale=forecast.stale,
+        hourly=forecast.hourly(since=time.time(), limit=hours),
+        daily=forecast.daily()
+    )
+
+@router.get("/stations/nearest", response_model=List[StationDistance])
+async def get_nearest_stations(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    k: int = Query(1, ge=1, le=100, description="Number of stations")
+):
+    """Get the k monitored stations closest to a point"""
+    return [_station_distance(city, distance) for city, distance in station_index.nearest(lat, lon, k)]
+
+@router.get("/stations/within", response_model=List[StationDistance])
+async def get_stations_within(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius_km: float = Query(..., gt=0, le=2000, description="Search radius in kilometres")
+):
+    """Get the monitored stations within a radius of a point"""
+    return [_station_distance(city, distance) for city, distance in station_index.within(lat, lon, radius_km)]
+
+@router.get("/cities", response_model=List[CityInfo])
+async def list_cities():
+    """Get every monitored city"""
+    return city_registry.get_all()
+
+@router.get("/cities/{city}", response_model=CityInfo)
+async def get_city(city: str):
+    """Get a monitored city"""
+    info = city_registry.get(city)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+    return info
+
+@router.post("/cities", response_model=CityInfo, status_code=201)
+async def add_city(city: CityCreate):
+    """Register a city; its robot starts without a restart"""
+    if city_registry.exists(city.city):
+        raise HTTPException(status_code=409, detail=f"City '{city.city}' already exists")
+    try:
+        return city_registry.add(city.city, city.dict(exclude={"city"}))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/cities/{city}", response_model=CityInfo)
+async def update_city(city: str, changes: CityUpdate):
+    """Update a city's details or robot interval"""
+    if not city_registry.exists(city):
+        raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+    try:
+        return city_registry.update(city, changes.dict(exclude_unset=True, exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/cities/{city}", status_code=204)
+async def remove_city(city: str):
+    """Unregister a city and stop its robot"""
+    if not city_registry.exists(city):
+        raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+    city_registry.remove(city)
+
+def _station_distance(city: str, distance: float) -> StationDistance:
+    city_info = settings.CITIES[city]
+    return StationDistance(
+        city=city,
+        name=city_info["name"],
+        lat=city_info["lat"],
+        lon=city_info["lon"],
+        distance_km=round(distance, 2)
     )
@@ -1,11 +1,11 @@
 """
 WebSocket routes for real-time communication
 """
-import json
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.websocket_manager import websocket_manager
 from app.services.chat_service import ChatService
+from app.utils.codec import SharedFrame, decode, receive_payload
 
 logger = logging.getLogger(__name__)
 
@@ -14,24 +14,38 @@ router = APIRouter()
 @router.websocket("/ws/observer")
 async def websocket_observer(websocket: WebSocket):
     """WebSocket endpoint for observers"""
-    await websocket_manager.connect_observer(websocket)
+    # ?cities=bogota,san_* subscribes from the start, ?mode=delta opts into deltas, and the
+    # "weather.msgpack" / "+deflate" subprotocols switch to binary and/or compressed frames
+    cities = websocket.query_params.get("cities", "")
+    topics = [city.strip().lower() for city in cities.split(",") if city.strip()]
+    delta = websocket.query_params.get("mode") == "delta"
+    await websocket_manager.connect_observer(websocket, topics, delta=delta)
     
     try:
         while True:
-            # Wait for messages from client (chat)
-            data = await websocket.receive_text()
-            logger.info(f"💬 Chat message from observer: {data}")
+            # Wait for messages from client (chat or topic subscriptions)
+            payload = await receive_payload(websocket)
+            text = payload if isinstance(payload, str) else None
             
             try:
-                # Try to parse as JSON
-                message_data = json.loads(data)
-                content = message_data.get("content", data)
-            except json.JSONDecodeError:
-                content = data
+                # Try to parse as JSON (or MessagePack for binary frames)
+                message_data = decode(payload)
+            except ValueError:
+                message_data = None
+            
+            if isinstance(message_data, dict):
+                if websocket_manager.handle_control(websocket, message_data):
+                    continue
+                content = message_data.get("content", text)
+            else:
+                content = text if text is not None else message_data
+            if not isinstance(content, str):
+                continue
+            logger.info(f"💬 Chat message from observer: {content}")
             
             # Handle chat message
             response = await ChatService.handle_chat_message(content)
-            await websocket.send_text(json.dumps(response))
+            websocket_manager.send_to_observer(websocket, SharedFrame(response))
                 
     except WebSocketDisconnect:
         websocket_manager.disconnect_observer(websocket)
@@ -2,7 +2,8 @@
 Configuration settings for the Weather WebSocket Server
 """
 import os
-from typing import Dict, Any
+import tempfile
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,10 +14,68 @@ class Settings:
     
     # API Configuration
     OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "demo_key_for_testing")
+    # Point at owm_stub_server.py (e.g. http://127.0.0.1:8001/data/2.5) to exercise the HTTP path offline
+    OPENWEATHER_BASE_URL: str = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+    OPENWEATHER_GROUP_MAX_IDS: int = int(os.getenv("OPENWEATHER_GROUP_MAX_IDS", "20"))  # provider limit per group call
+    
+    # Upstream HTTP client Configuration
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # seconds
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))  # seconds
+    
+    # Upstream quota Configuration (0 = unlimited)
+    OPENWEATHER_CALLS_PER_MINUTE: int = int(os.getenv("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+    OPENWEATHER_CALLS_PER_DAY: int = int(os.getenv("OPENWEATHER_CALLS_PER_DAY", "30000"))
+    OPEN_METEO_CALLS_PER_MINUTE: int = int(os.getenv("OPEN_METEO_CALLS_PER_MINUTE", "600"))
+    OPEN_METEO_CALLS_PER_DAY: int = int(os.getenv("OPEN_METEO_CALLS_PER_DAY", "10000"))
+    QUOTA_ROBOT_RESERVE: float = float(os.getenv("QUOTA_ROBOT_RESERVE", "0.25"))  # share of the minute budget only robots may use
+    QUOTA_MAX_WAIT: float = float(os.getenv("QUOTA_MAX_WAIT", "10"))  # seconds a robot refresh may queue for budget
+    
+    # Weather cache Configuration
+    WEATHER_CACHE_TTL: float = float(os.getenv("WEATHER_CACHE_TTL", "60"))  # seconds
+    GEOHASH_PRECISION: int = int(os.getenv("GEOHASH_PRECISION", "5"))  # 5 chars ≈ 4.9km x 4.9km buckets
+    GEO_CACHE_TTL: float = float(os.getenv("GEO_CACHE_TTL", "300"))  # seconds
+    GEO_CACHE_MAX_BYTES: int = int(os.getenv("GEO_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+    
+    # Weather snapshot Configuration (latest readings persisted for warm restarts)
+    WEATHER_SNAPSHOT_FILE: str = os.getenv("WEATHER_SNAPSHOT_FILE", "data/weather_snapshot.json")
+    WEATHER_SNAPSHOT_INTERVAL: float = float(os.getenv("WEATHER_SNAPSHOT_INTERVAL", "30"))  # seconds (0 = disabled)
+    WEATHER_SNAPSHOT_MAX_AGE: float = float(os.getenv("WEATHER_SNAPSHOT_MAX_AGE", "21600"))  # ignore snapshots older than this
+    
+    # Forecast Configuration
+    FORECAST_REFRESH_WINDOW: float = float(os.getenv("FORECAST_REFRESH_WINDOW", "1800"))  # seconds
+    FORECAST_HOURS: int = int(os.getenv("FORECAST_HOURS", "72"))
+    
+    # Station spatial index Configuration
+    STATION_INDEX_CELL_DEGREES: float = float(os.getenv("STATION_INDEX_CELL_DEGREES", "0.1"))
+    
+    # Weather providers in priority order (primary first) and hedging Configuration
+    WEATHER_PROVIDERS: list = [name.strip() for name in os.getenv("WEATHER_PROVIDERS", "openweathermap,open_meteo").split(",") if name.strip()]
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_DEFAULT_DELAY: float = float(os.getenv("HEDGE_DEFAULT_DELAY", "0.5"))  # seconds, until enough samples
+    HEDGE_MIN_DELAY: float = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))  # seconds
+    HEDGE_MAX_DELAY: float = float(os.getenv("HEDGE_MAX_DELAY", "2"))  # seconds
+    
+    # Synthetic weather Configuration (add "synthetic" to WEATHER_PROVIDERS to use it as a provider)
+    SIMULATION_SEED: int = int(os.getenv("SIMULATION_SEED", "42"))
+    SIMULATION_START: Optional[float] = float(os.getenv("SIMULATION_START")) if os.getenv("SIMULATION_START") else None  # epoch seconds
+    SIMULATION_STEP: float = float(os.getenv("SIMULATION_STEP", "60"))  # seconds per noise step
+    SIMULATION_CITY_COUNT: int = int(os.getenv("SIMULATION_CITY_COUNT", "0"))  # generated stations added at startup
+    SIMULATION_ROBOT_INTERVAL: int = int(os.getenv("SIMULATION_ROBOT_INTERVAL", "30"))  # seconds
+    
+    # Circuit breaker Configuration
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "3"))
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "30"))  # seconds
     
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Per-connection permessage-deflate in uvicorn; clients on the "+deflate" subprotocols are already compressed once per payload
+    WEBSOCKET_PER_MESSAGE_DEFLATE: bool = os.getenv("WEBSOCKET_PER_MESSAGE_DEFLATE", "true").lower() == "true"
     
     # CORS Configuration
     ALLOWED_ORIGINS: list = [
@@ -28,15 +87,53 @@ class Settings:
     APP_NAME: str = "Real WebSocket Weather Server"
     VERSION: str = "2.0.0"
     
+    # City registry Configuration (cities added at runtime are persisted here)
+    CITY_REGISTRY_FILE: str = os.getenv("CITY_REGISTRY_FILE", "data/cities.json")
+    CITY_REGISTRY_POLL_INTERVAL: float = float(os.getenv("CITY_REGISTRY_POLL_INTERVAL", "5"))  # seconds between checks for changes by other workers
+    
+    # Observer fanout Configuration
+    OBSERVER_QUEUE_SIZE: int = int(os.getenv("OBSERVER_QUEUE_SIZE", "256"))  # outbound frames buffered per observer
+    OBSERVER_OVERFLOW_POLICY: str = os.getenv("OBSERVER_OVERFLOW_POLICY", "latest_per_city")  # drop_oldest | latest_per_city | disconnect
+    OBSERVER_EVICT_AFTER_DROPS: int = int(os.getenv("OBSERVER_EVICT_AFTER_DROPS", "1000"))  # drops without catching up before eviction (0 = never)
+    OBSERVER_FLUSH_WINDOW: float = float(os.getenv("OBSERVER_FLUSH_WINDOW", "0.1"))  # seconds city updates are merged into one frame (0 = send each)
+    OBSERVER_MAX_TOPICS: int = int(os.getenv("OBSERVER_MAX_TOPICS", "1000"))  # subscriptions allowed per observer
+    
     # Robot Configuration
     ROBOT_INTERVALS: Dict[str, int] = {
         "bogota": 15,
         "medellin": 20
     }
+    ROBOT_TICK_RESOLUTION: float = float(os.getenv("ROBOT_TICK_RESOLUTION", "0.25"))  # seconds per timer-wheel tick
+    ROBOT_JITTER: float = float(os.getenv("ROBOT_JITTER", "0.1"))  # ± share of the interval added to each refresh
+    ROBOT_STARTUP_SPREAD: float = float(os.getenv("ROBOT_STARTUP_SPREAD", "5"))  # seconds over which first refreshes are staggered
+    ROBOT_BATCH_SIZE: int = int(os.getenv("ROBOT_BATCH_SIZE", "100"))  # due cities refreshed per worker batch
+    ROBOT_WORKERS: int = int(os.getenv("ROBOT_WORKERS", "4"))
+    ROBOT_ADAPTIVE_INTERVALS: bool = os.getenv("ROBOT_ADAPTIVE_INTERVALS", "true").lower() == "true"
+    ROBOT_MIN_INTERVAL: float = float(os.getenv("ROBOT_MIN_INTERVAL", "5"))  # seconds
+    ROBOT_MAX_INTERVAL: float = float(os.getenv("ROBOT_MAX_INTERVAL", "300"))  # seconds
+    ROBOT_INTERVAL_BACKOFF: float = float(os.getenv("ROBOT_INTERVAL_BACKOFF", "1.5"))  # max growth per poll while readings are flat
+    # Only the worker holding this lock runs robots; needs a cross-process broker so followers still get updates
+    ROBOT_LEADER_ELECTION: bool = os.getenv("ROBOT_LEADER_ELECTION", "false").lower() == "true"
+    ROBOT_LEADER_LOCK_FILE: str = os.getenv("ROBOT_LEADER_LOCK_FILE", os.path.join(tempfile.gettempdir(), "weather_robots.lock"))
+    ROBOT_LEADER_RETRY_INTERVAL: float = float(os.getenv("ROBOT_LEADER_RETRY_INTERVAL", "2"))  # seconds between follower attempts
+    
+    # Pub/sub broker Configuration (run app.services.broker.server and use "unix" to share fanout across workers)
+    # Defaults to the socket broker when leader election is on, so follower workers still get robot updates
+    BROKER_BACKEND: str = os.getenv("BROKER_BACKEND", "unix" if ROBOT_LEADER_ELECTION else "local")  # local | unix
+    BROKER_SOCKET_PATH: str = os.getenv("BROKER_SOCKET_PATH", os.path.join(tempfile.gettempdir(), "weather_broker.sock"))
+    BROKER_RECONNECT_INTERVAL: float = float(os.getenv("BROKER_RECONNECT_INTERVAL", "1"))  # seconds between connection attempts
+    BROKER_MAX_CLIENT_BUFFER: int = int(os.getenv("BROKER_MAX_CLIENT_BUFFER", str(8 * 1024 * 1024)))  # bytes queued for a worker before the broker drops it
+    
+    # Weather change significance Configuration
+    WEATHER_CHANGE_TEMPERATURE: float = float(os.getenv("WEATHER_CHANGE_TEMPERATURE", "0.5"))  # °C
+    WEATHER_CHANGE_HUMIDITY: float = float(os.getenv("WEATHER_CHANGE_HUMIDITY", "2"))  # percentage points
+    WEATHER_KEEPALIVE_INTERVAL: float = float(os.getenv("WEATHER_KEEPALIVE_INTERVAL", "60"))  # seconds between keep-alives for unchanged cities (0 = never)
+    WEATHER_FULL_BROADCAST_INTERVAL: float = float(os.getenv("WEATHER_FULL_BROADCAST_INTERVAL", "300"))  # resend unchanged readings in full after this long (0 = never)
     
     # City Coordinates for OpenWeatherMap API
     CITIES: Dict[str, Dict[str, Any]] = {
         "bogota": {
+            "owm_id": 3688689,
             "lat": 4.7110, 
             "lon": -74.0721, 
             "name": "Bogotá", 
@@ -45,6 +142,7 @@ class Settings:
             "avg_temp_range": "14-20°C"
         },
         "medellin": {
+            "owm_id": 3674962,
             "lat": 6.2442, 
             "lon": -75.5812, 
             "name": "Medellín", 
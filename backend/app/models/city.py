@@ -0,0 +1,40 @@
+"""
+Pydantic models for the runtime city registry
+"""
+from pydantic import BaseModel
+from typing import Optional
+
+class CityInfo(BaseModel):
+    """Monitored city (station) model"""
+    city: str
+    name: str
+    lat: float
+    lon: float
+    emoji: str
+    altitude: Optional[int] = None
+    avg_temp_range: Optional[str] = None
+    owm_id: Optional[int] = None
+    interval: Optional[float] = None
+
+class CityCreate(BaseModel):
+    """New city request model"""
+    city: str
+    name: str
+    lat: float
+    lon: float
+    emoji: str = "📍"
+    altitude: Optional[int] = None
+    avg_temp_range: Optional[str] = None
+    owm_id: Optional[int] = None
+    interval: Optional[float] = None
+
+class CityUpdate(BaseModel):
+    """Partial city update request model"""
+    name: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    emoji: Optional[str] = None
+    altitude: Optional[int] = None
+    avg_temp_range: Optional[str] = None
+    owm_id: Optional[int] = None
+    interval: Optional[float] = None
@@ -0,0 +1,92 @@
+"""
+Compact hourly forecast model backed by typed arrays
+"""
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+COLOMBIA_TZ = timezone(timedelta(hours=-5))
+
+# Descriptions are interned so each forecast hour stores a 2-byte index
+_DESCRIPTIONS: List[str] = []
+_DESCRIPTION_INDEX: Dict[str, int] = {}
+
+def intern_description(description: str) -> int:
+    """Get the compact index of a description"""
+    index = _DESCRIPTION_INDEX.get(description)
+    if index is None:
+        index = len(_DESCRIPTIONS)
+        _DESCRIPTIONS.append(description)
+        _DESCRIPTION_INDEX[description] = index
+    return index
+
+# (epoch seconds UTC, temperature °C, humidity %, description)
+ForecastPoint = Tuple[float, float, int, str]
+
+@dataclass
+class CityForecast:
+    """Hourly forecast for one city stored column-wise in typed arrays"""
+    city: str
+    source: str
+    fetched_at: float
+    times: array  # 'd' epoch seconds UTC
+    temperatures: array  # 'f' °C
+    humidity: array  # 'B' %
+    descriptions: array  # 'H' interned description index
+    stale: bool = False
+
+    @classmethod
+    def from_points(cls, city: str, source: str, fetched_at: float, points: Iterable[ForecastPoint]) -> "CityForecast":
+        """Build the compact forecast from hourly points"""
+        forecast = cls(city, source, fetched_at, array("d"), array("f"), array("B"), array("H"))
+        for timestamp, temperature, humidity, description in sorted(points):
+            forecast.times.append(timestamp)
+            forecast.temperatures.append(temperature)
+            forecast.humidity.append(max(0, min(100, int(humidity))))
+            forecast.descriptions.append(intern_description(description))
+        return forecast
+
+    def hourly(self, since: float, limit: int) -> List[dict]:
+        """Get the upcoming hourly points from `since`"""
+        hours = []
+        for index, timestamp in enumerate(self.times):
+            if timestamp < since - 3600:
+                continue
+            hours.append({
+                "time": datetime.fromtimestamp(timestamp, COLOMBIA_TZ).isoformat(),
+                "temperature": round(self.temperatures[index], 1),
+                "humidity": self.humidity[index],
+                "description": _DESCRIPTIONS[self.descriptions[index]]
+            })
+            if len(hours) >= limit:
+                break
+        return hours
+
+    def daily(self) -> List[dict]:
+        """Summarize the forecast per day (Colombia time)"""
+        days: Dict[str, List[int]] = {}
+        for index, timestamp in enumerate(self.times):
+            date = datetime.fromtimestamp(timestamp, COLOMBIA_TZ).date().isoformat()
+            days.setdefault(date, []).append(index)
+
+        summary = []
+        for date, indexes in days.items():
+            temperatures = [self.temperatures[index] for index in indexes]
+            descriptions = Counter(self.descriptions[index] for index in indexes)
+            summary.append({
+                "date": date,
+                "min_temperature": round(min(temperatures), 1),
+                "max_temperature": round(max(temperatures), 1),
+                "avg_humidity": round(sum(self.humidity[index] for index in indexes) / len(indexes)),
+                "description": _DESCRIPTIONS[descriptions.most_common(1)[0][0]]
+            })
+        return summary
+
+    def nbytes(self) -> int:
+        """Approximate in-memory size of the arrays"""
+        return sum(
+            values.itemsize * len(values)
+            for values in (self.times, self.temperatures, self.humidity, self.descriptions)
+        )
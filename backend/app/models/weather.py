@@ -3,7 +3,7 @@ Pydantic models for weather data and API responses
 """
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class WeatherData(BaseModel):
     """Weather data model"""
@@ -17,6 +17,40 @@ class WeatherData(BaseModel):
     source: str
     real_data: bool
     altitude: Optional[int] = None
+    stale: bool = False
+
+class StationDistance(BaseModel):
+    """Monitored station with its distance to a query point"""
+    city: str
+    name: str
+    lat: float
+    lon: float
+    distance_km: float
+
+class ForecastHour(BaseModel):
+    """Hourly forecast point"""
+    time: str
+    temperature: float
+    humidity: int
+    description: str
+
+class ForecastDay(BaseModel):
+    """Daily forecast summary"""
+    date: str
+    min_temperature: float
+    max_temperature: float
+    avg_humidity: int
+    description: str
+
+class ForecastResponse(BaseModel):
+    """Forecast endpoint response model"""
+    city: str
+    name: str
+    source: str
+    fetched_at: str
+    stale: bool
+    hourly: List[ForecastHour]
+    daily: List[ForecastDay]
 
 class ChatResponse(BaseModel):
     """Chat response model"""
@@ -31,6 +65,25 @@ class WeatherUpdate(BaseModel):
     data: WeatherData
     message: str
 
+class WeatherSnapshotMessage(BaseModel):
+    """Latest reading of every subscribed city, sent in one frame on connect"""
+    type: str = "weather_snapshot"
+    data: List[WeatherData]
+    timestamp: str
+
+class WeatherKeepalive(BaseModel):
+    """Keep-alive sent instead of an unchanged weather update"""
+    type: str = "weather_keepalive"
+    robot: str
+    city: str
+    time: str
+
+class SubscriptionAck(BaseModel):
+    """Current topic subscriptions of an observer, sent after subscribe/unsubscribe"""
+    type: str = "subscribed"
+    topics: List[str]
+    cities: int
+
 class ConnectionMessage(BaseModel):
     """WebSocket connection message model"""
     type: str
@@ -45,6 +98,19 @@ class ServerStatus(BaseModel):
     observers_connected: int
     robot_tasks: list
     uptime: str
+    weather_cache: Optional[Dict[str, Any]] = None
+    circuit_breakers: Optional[Dict[str, Any]] = None
+    weather_providers: Optional[Dict[str, Any]] = None
+    upstream_quota: Optional[Dict[str, Any]] = None
+    geo_cache: Optional[Dict[str, Any]] = None
+    station_index: Optional[Dict[str, Any]] = None
+    forecast_store: Optional[Dict[str, Any]] = None
+    robot_intervals: Optional[Dict[str, float]] = None
+    broadcasts: Optional[Dict[str, Any]] = None
+    robot_leader: Optional[Dict[str, Any]] = None
+    weather_snapshot: Optional[Dict[str, Any]] = None
+    observer_fanout: Optional[Dict[str, Any]] = None
+    broker: Optional[Dict[str, Any]] = None
 
 class RootResponse(BaseModel):
     """Root endpoint response model"""
@@ -0,0 +1,90 @@
+"""
+Adaptive robot polling intervals driven by observed weather volatility
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from app.core.settings import settings
+from app.models.weather import WeatherData
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _CityVolatility:
+    temperature: int
+    humidity: int
+    description: str
+    observed_at: float
+    interval: float
+    rate: float = 0.0  # significant changes per minute (smoothed)
+
+class AdaptivePolling:
+    """Per-city polling interval sized so each poll sees about one significant change.
+
+    A change is scored in units of the significance thresholds
+    (WEATHER_CHANGE_TEMPERATURE, WEATHER_CHANGE_HUMIDITY, one unit for a new
+    description) and turned into a per-minute rate. The smoothed rate rises
+    quickly and decays slowly, and the interval grows by at most
+    ROBOT_INTERVAL_BACKOFF per poll, so polling backs off gradually while
+    readings stay flat and drops back to at most the base interval as soon as
+    a significant change is seen.
+    """
+
+    RISE_ALPHA = 0.7
+    DECAY_ALPHA = 0.2
+
+    def __init__(self):
+        self.cities: Dict[str, _CityVolatility] = {}
+
+    def observe(self, city: str, weather: WeatherData, base_interval: float) -> float:
+        """Record a fresh reading and return the city's next polling interval"""
+        now = time.monotonic()
+        state = self.cities.get(city)
+        if state is None:
+            self.cities[city] = _CityVolatility(
+                weather.temperature, weather.humidity, weather.description, now, base_interval
+            )
+            return base_interval
+        if not settings.ROBOT_ADAPTIVE_INTERVALS:
+            state.interval = base_interval
+            return base_interval
+
+        change = (
+            abs(weather.temperature - state.temperature) / settings.WEATHER_CHANGE_TEMPERATURE
+            + abs(weather.humidity - state.humidity) / settings.WEATHER_CHANGE_HUMIDITY
+            + (1.0 if weather.description != state.description else 0.0)
+        )
+        elapsed = max(now - state.observed_at, settings.ROBOT_TICK_RESOLUTION)
+        rate = change * 60 / elapsed
+        alpha = self.RISE_ALPHA if rate > state.rate else self.DECAY_ALPHA
+        state.rate += alpha * (rate - state.rate)
+
+        target = 60 / state.rate if state.rate > 0 else settings.ROBOT_MAX_INTERVAL
+        target = min(target, state.interval * settings.ROBOT_INTERVAL_BACKOFF)
+        if change >= 1:
+            # A significant change means the weather is moving: never wait longer than the base interval
+            target = min(target, base_interval)
+        state.interval = max(settings.ROBOT_MIN_INTERVAL, min(settings.ROBOT_MAX_INTERVAL, target))
+
+        state.temperature = weather.temperature
+        state.humidity = weather.humidity
+        state.description = weather.description
+        state.observed_at = now
+        return state.interval
+
+    def get_interval(self, city: str) -> Optional[float]:
+        """Current polling interval for a city, if it has been observed"""
+        state = self.cities.get(city)
+        return state.interval if state else None
+
+    def forget(self, city: str):
+        """Drop a city's history"""
+        self.cities.pop(city, None)
+
+    def clear(self):
+        """Drop every city's history"""
+        self.cities.clear()
+
+# Global adaptive polling instance
+adaptive_polling = AdaptivePolling()
@@ -0,0 +1,28 @@
+"""
+Pub/sub broker module.
+
+Robot updates are published once to a broker and fanned out by every server
+process to its own observer connections. BROKER_BACKEND selects the
+implementation: "local" (single process) or "unix" (the broker process in
+app.services.broker.server). A Redis backend would implement the
+same Broker interface for multi-host deployments.
+"""
+from app.core.settings import settings
+from app.services.broker.base import Broker
+from app.services.broker.local import LocalBroker
+from app.services.broker.unix_socket import UnixSocketBroker
+
+def weather_channel(city: str) -> str:
+    """Channel carrying a city's robot updates"""
+    return f"weather:{city}"
+
+def create_broker() -> Broker:
+    """Build the broker selected by BROKER_BACKEND"""
+    if settings.BROKER_BACKEND == "unix":
+        return UnixSocketBroker(settings.BROKER_SOCKET_PATH, settings.BROKER_RECONNECT_INTERVAL)
+    if settings.BROKER_BACKEND != "local":
+        raise ValueError(f"Unknown BROKER_BACKEND '{settings.BROKER_BACKEND}' (expected local or unix)")
+    return LocalBroker()
+
+# Global broker instance
+broker = create_broker()
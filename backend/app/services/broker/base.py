@@ -0,0 +1,60 @@
+"""
+Base interface for the pub/sub broker that fans messages out across server processes
+"""
+import fnmatch
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Any], Awaitable[None]]
+
+class Broker(ABC):
+    """Redis-shaped pub/sub: messages are published to named channels and
+    delivered to every handler whose glob pattern (PSUBSCRIBE style) matches.
+
+    Each server process publishes once and receives every matching message,
+    including its own, then fans it out to its local WebSocket connections.
+    Messages are JSON-compatible dicts; handlers must treat them as read-only.
+    """
+
+    name: str = ""
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    async def start(self):
+        """Connect to the broker (no-op for in-process delivery)"""
+
+    async def stop(self):
+        """Disconnect from the broker"""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        """Publish a message to a channel"""
+
+    def subscribe(self, pattern: str, handler: Handler):
+        """Call handler(channel, message) for every message on channels matching pattern"""
+        self.handlers.setdefault(pattern, []).append(handler)
+
+    async def _dispatch(self, channel: str, message: Dict[str, Any]):
+        for pattern, handlers in self.handlers.items():
+            if fnmatch.fnmatchcase(channel, pattern):
+                for handler in handlers:
+                    try:
+                        await handler(channel, message)
+                        self.delivered += 1
+                    except Exception as e:
+                        logger.error(f"❌ Error handling broker message on {channel}: {e}")
+
+    def get_stats(self) -> dict:
+        """Get publish/delivery counters"""
+        return {
+            "backend": self.name,
+            "patterns": sorted(self.handlers),
+            "published": self.published,
+            "delivered": self.delivered
+        }
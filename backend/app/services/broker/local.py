@@ -0,0 +1,14 @@
+"""
+In-process broker for single-process deployments
+"""
+from typing import Any, Dict
+from app.services.broker.base import Broker
+
+class LocalBroker(Broker):
+    """Delivers published messages straight to this process's handlers"""
+
+    name = "local"
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        self.published += 1
+        await self._dispatch(channel, message)
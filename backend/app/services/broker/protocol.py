@@ -0,0 +1,26 @@
+"""
+Length-prefixed frames spoken between broker clients and the Unix-socket broker process
+"""
+import asyncio
+import struct
+from typing import Tuple
+
+PUBLISH = b"P"
+SUBSCRIBE = b"S"
+UNSUBSCRIBE = b"U"
+MESSAGE = b"M"
+
+# kind, channel length, payload length
+HEADER = struct.Struct(">cHI")
+
+def pack_frame(kind: bytes, channel: str, payload: bytes = b"") -> bytes:
+    """Build one frame; the payload is opaque to the broker and forwarded as is"""
+    channel_bytes = channel.encode("utf-8")
+    return HEADER.pack(kind, len(channel_bytes), len(payload)) + channel_bytes + payload
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[bytes, str, bytes]:
+    """Read one frame (raises asyncio.IncompleteReadError when the peer closes)"""
+    kind, channel_length, payload_length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    channel = (await reader.readexactly(channel_length)).decode("utf-8")
+    payload = await reader.readexactly(payload_length) if payload_length else b""
+    return kind, channel, payload
@@ -0,0 +1,119 @@
+"""
+Standalone Unix-domain-socket broker process.
+
+Run it next to the server workers (from the backend directory):
+
+    python -m app.services.broker.server
+
+and start the workers with BROKER_BACKEND=unix.
+"""
+import argparse
+import asyncio
+import fnmatch
+import logging
+import os
+from typing import Dict, List, Set
+from app.core.settings import settings
+from app.services.broker.protocol import MESSAGE, PUBLISH, SUBSCRIBE, UNSUBSCRIBE, pack_frame, read_frame
+
+logger = logging.getLogger(__name__)
+
+class BrokerClient:
+    """One connected server process and its subscribed patterns"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.patterns: Set[str] = set()
+
+class BrokerServer:
+    """Routes each published frame to every client with a matching pattern.
+
+    Payloads are forwarded without decoding, and the outgoing frame is built
+    once per publish. Routes are cached per channel until a subscription
+    changes. A client whose socket buffer grows past max_buffer bytes is
+    disconnected rather than allowed to stall the others.
+    """
+
+    def __init__(self, path: str, max_buffer: int):
+        self.path = path
+        self.max_buffer = max_buffer
+        self.clients: Set[BrokerClient] = set()
+        self._routes: Dict[str, List[BrokerClient]] = {}
+        self.published = 0
+
+    async def serve(self):
+        """Listen on the socket path until cancelled"""
+        if os.path.exists(self.path):
+            try:
+                _, writer = await asyncio.open_unix_connection(self.path)
+                writer.close()
+                raise SystemExit(f"A broker is already listening on {self.path}")
+            except OSError:
+                # Stale socket file left by a broker that died
+                os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        os.chmod(self.path, 0o600)
+        logger.info(f"📮 Broker listening on {self.path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = BrokerClient(writer)
+        self.clients.add(client)
+        logger.info(f"📮 Worker connected ({len(self.clients)} total)")
+        try:
+            while True:
+                kind, channel, payload = await read_frame(reader)
+                if kind == PUBLISH:
+                    self._route(channel, payload)
+                elif kind == SUBSCRIBE:
+                    client.patterns.add(channel)
+                    self._routes.clear()
+                elif kind == UNSUBSCRIBE:
+                    client.patterns.discard(channel)
+                    self._routes.clear()
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._drop(client)
+
+    def _route(self, channel: str, payload: bytes):
+        self.published += 1
+        subscribers = self._routes.get(channel)
+        if subscribers is None:
+            subscribers = self._routes[channel] = [
+                client for client in self.clients
+                if any(fnmatch.fnmatchcase(channel, pattern) for pattern in client.patterns)
+            ]
+        frame = pack_frame(MESSAGE, channel, payload)
+        for client in list(subscribers):
+            if client.writer.transport.get_write_buffer_size() > self.max_buffer:
+                logger.warning(f"🐢 Dropping worker that stopped reading ({self.max_buffer} bytes buffered)")
+                self._drop(client)
+                continue
+            client.writer.write(frame)
+
+    def _drop(self, client: BrokerClient):
+        if client in self.clients:
+            self.clients.discard(client)
+            self._routes.clear()
+            client.writer.close()
+            logger.info(f"📮 Worker disconnected ({len(self.clients)} left)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Unix-socket pub/sub broker for the weather server workers")
+    parser.add_argument("--path", default=settings.BROKER_SOCKET_PATH, help="socket path (default: BROKER_SOCKET_PATH)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    server = BrokerServer(args.path, settings.BROKER_MAX_CLIENT_BUFFER)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        logger.info("🛑 Broker stopped")
+
+if __name__ == "__main__":
+    main()
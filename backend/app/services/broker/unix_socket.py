@@ -0,0 +1,115 @@
+"""
+Client for the local Unix-domain-socket broker process (app.services.broker.server)
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+from app.services.broker.base import Broker, Handler
+from app.services.broker.protocol import MESSAGE, PUBLISH, SUBSCRIBE, pack_frame, read_frame
+
+logger = logging.getLogger(__name__)
+
+class UnixSocketBroker(Broker):
+    """Publishes through the broker process and receives matching messages back from it.
+
+    Messages are JSON-encoded once by the publisher and forwarded untouched.
+    While the broker is unreachable, publishes are delivered to this process
+    only so its own clients keep getting updates; the connection is retried
+    every reconnect_interval seconds and subscriptions are replayed.
+    """
+
+    name = "unix"
+
+    def __init__(self, path: str, reconnect_interval: float):
+        super().__init__()
+        self.path = path
+        self.reconnect_interval = reconnect_interval
+        self.connected = False
+        self.reconnects = 0
+        self.local_fallbacks = 0
+        self.malformed = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._close()
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        self.published += 1
+        if not self.connected:
+            self.local_fallbacks += 1
+            await self._dispatch(channel, message)
+            return
+        payload = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        writer = self._writer
+        try:
+            writer.write(pack_frame(PUBLISH, channel, payload))
+            await writer.drain()
+        except OSError:
+            # Connection dropped under us; the reader task will reconnect
+            self.local_fallbacks += 1
+            await self._dispatch(channel, message)
+
+    def subscribe(self, pattern: str, handler: Handler):
+        new_pattern = pattern not in self.handlers
+        super().subscribe(pattern, handler)
+        if new_pattern and self.connected:
+            self._writer.write(pack_frame(SUBSCRIBE, pattern))
+
+    async def _run(self):
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                for pattern in self.handlers:
+                    self._writer.write(pack_frame(SUBSCRIBE, pattern))
+                await self._writer.drain()
+                self.connected = True
+                logger.info(f"📮 Connected to broker at {self.path}")
+                while True:
+                    kind, channel, payload = await read_frame(reader)
+                    if kind != MESSAGE:
+                        continue
+                    try:
+                        message = json.loads(payload)
+                    except ValueError as e:
+                        # One bad frame must not stop this worker's broadcasts
+                        self.malformed += 1
+                        logger.error(f"❌ Dropping malformed broker message on {channel}: {e}")
+                        continue
+                    await self._dispatch(channel, message)
+            except asyncio.CancelledError:
+                break
+            except (OSError, asyncio.IncompleteReadError) as e:
+                if self.connected:
+                    logger.warning(f"⚠️ Lost broker connection, delivering locally until it's back: {e}")
+                    self.reconnects += 1
+                else:
+                    logger.debug(f"Broker at {self.path} unavailable: {e}")
+            finally:
+                self._close()
+            await asyncio.sleep(self.reconnect_interval)
+
+    def _close(self):
+        self.connected = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats.update({
+            "path": self.path,
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "local_fallbacks": self.local_fallbacks,
+            "malformed": self.malformed
+        })
+        return stats
@@ -0,0 +1,77 @@
+"""
+Change detection for robot weather broadcasts
+"""
+import logging
+import time
+from typing import Dict, Tuple
+from app.core.settings import settings
+from app.models.weather import WeatherData
+
+logger = logging.getLogger(__name__)
+
+class BroadcastDecision:
+    FULL = "full"
+    KEEPALIVE = "keepalive"
+    SUPPRESS = "suppress"
+
+class ChangeDetector:
+    """Decides whether a robot reading is worth a full broadcast.
+
+    Readings are compared with the last one actually broadcast for the city,
+    so slow drift still gets through once it adds up past a threshold.
+    Unchanged readings become a small keep-alive at most every
+    WEATHER_KEEPALIVE_INTERVAL seconds and are dropped otherwise.
+    """
+
+    def __init__(self):
+        self.last_broadcast: Dict[str, Tuple[WeatherData, float]] = {}
+        self.last_keepalive: Dict[str, float] = {}
+        self.counts = {BroadcastDecision.FULL: 0, BroadcastDecision.KEEPALIVE: 0, BroadcastDecision.SUPPRESS: 0}
+
+    def decide(self, city: str, weather: WeatherData) -> str:
+        """Classify a reading as a full update, keep-alive or suppressed"""
+        now = time.monotonic()
+        previous = self.last_broadcast.get(city)
+        if previous is None or self._is_significant(previous[0], weather) or self._is_due(previous[1], now):
+            self.last_broadcast[city] = (weather, now)
+            self.last_keepalive[city] = now
+            decision = BroadcastDecision.FULL
+        elif settings.WEATHER_KEEPALIVE_INTERVAL and now - self.last_keepalive.get(city, 0) >= settings.WEATHER_KEEPALIVE_INTERVAL:
+            self.last_keepalive[city] = now
+            decision = BroadcastDecision.KEEPALIVE
+        else:
+            decision = BroadcastDecision.SUPPRESS
+        self.counts[decision] += 1
+        return decision
+
+    def forget(self, city: str):
+        """Drop a city's last broadcast so its next reading is sent in full"""
+        self.last_broadcast.pop(city, None)
+        self.last_keepalive.pop(city, None)
+
+    def _is_significant(self, previous: WeatherData, weather: WeatherData) -> bool:
+        return (
+            abs(weather.temperature - previous.temperature) >= settings.WEATHER_CHANGE_TEMPERATURE
+            or abs(weather.humidity - previous.humidity) >= settings.WEATHER_CHANGE_HUMIDITY
+            or weather.description != previous.description
+            or weather.stale != previous.stale
+            or weather.real_data != previous.real_data
+        )
+
+    def _is_due(self, broadcast_at: float, now: float) -> bool:
+        # Periodic full refresh so late joiners and dropped frames converge
+        interval = settings.WEATHER_FULL_BROADCAST_INTERVAL
+        return bool(interval) and now - broadcast_at >= interval
+
+    def get_stats(self) -> dict:
+        """Get broadcast decision counters and the share of readings not sent in full"""
+        total = sum(self.counts.values())
+        return {
+            "full": self.counts[BroadcastDecision.FULL],
+            "keepalive": self.counts[BroadcastDecision.KEEPALIVE],
+            "suppressed": self.counts[BroadcastDecision.SUPPRESS],
+            "suppression_ratio": round(1 - self.counts[BroadcastDecision.FULL] / total, 3) if total else 0.0
+        }
+
+# Global change detector instance
+change_detector = ChangeDetector()
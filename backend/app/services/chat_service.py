@@ -1,10 +1,15 @@
 """
 Chat service for handling intelligent question processing
 """
+import asyncio
 import logging
-from typing import Dict, Any
-from app.models.weather import ChatResponse
+import re
+from datetime import timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from app.models.weather import ChatResponse, WeatherData
 from app.services.weather_service import WeatherService
+from app.services.station_index import station_index
+from app.services.city_registry import city_registry
 from app.utils.helpers import (
     get_colombia_time, 
     get_humidity_description,
@@ -15,6 +20,28 @@ from app.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Decimal coordinates such as "4.65, -74.05"
+COORDINATES_PATTERN = re.compile(r"(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)")
+# Words that mark a number pair as a location (so "suma 2.5, 3.5" stays a calculation)
+COORDINATES_CONTEXT = re.compile(r"\b(lat|latitud|lon|lng|longitud|coordenadas?|cerca|cercana|ubicaci[oó]n|estaci[oó]n)\b|°")
+
+# Cities covered by multi-city summaries when a question names none
+SUMMARY_MAX_CITIES = 6
+
+# Extra descriptions for the original stations (registry cities only have coordinates)
+CITY_PROFILES = {
+    "bogota": {
+        "region": "Distrito Capital",
+        "population": "~8 millones (área metropolitana)",
+        "climate": "Subtropical de altitud (frío de montaña)"
+    },
+    "medellin": {
+        "region": "Antioquia",
+        "population": "~4 millones (área metropolitana)",
+        "climate": "Tropical de montaña (eterna primavera)"
+    }
+}
+
 class ChatService:
     """Service for intelligent chat message processing"""
     
@@ -23,12 +50,21 @@ class ChatService:
         """Sistema inteligente de procesamiento de preguntas con múltiples categorías"""
         content_lower = content.lower().strip()
         colombia_time = get_colombia_time()
+        coordinates = ChatService._find_coordinates(content_lower)
+        
+        # === 0. PREGUNTAS CON COORDENADAS (ESTACIÓN MÁS CERCANA) ===
+        if coordinates:
+            return await ChatService._handle_nearest_station(*coordinates, colombia_time)
+        
+        # === 1. PREGUNTAS SOBRE PRONÓSTICO (antes que clima: "pronóstico del clima", "temperatura mañana") ===
+        elif any(word in content_lower for word in ["pronóstico", "pronostico", "mañana", "después", "luego", "futuro"]):
+            return await ChatService._handle_forecast_questions(content_lower, colombia_time)
         
-        # === 1. PREGUNTAS SOBRE CLIMA ===
-        if any(word in content_lower for word in ["temperatura", "temperature", "clima", "weather", "calor", "frio", "frío", "grados"]):
+        # === 2. PREGUNTAS SOBRE CLIMA ===
+        elif any(word in content_lower for word in ["temperatura", "temperature", "clima", "weather", "calor", "frio", "frío", "grados"]):
             return await ChatService._handle_weather_questions(content_lower, colombia_time)
         
-        # === 2. PREGUNTAS SOBRE TIEMPO/HORA ===
+        # === 3. PREGUNTAS SOBRE TIEMPO/HORA ===
         elif any(word in content_lower for word in ["hora", "time", "qué hora", "que hora", "horario"]):
             return {
                 "type": "chat_response",
@@ -36,50 +72,42 @@ class ChatService:
                 "timestamp": colombia_time.isoformat()
             }
         
-        # === 3. PREGUNTAS SOBRE FECHA ===
+        # === 4. PREGUNTAS SOBRE FECHA ===
         elif any(word in content_lower for word in ["fecha", "date", "día", "dia", "hoy", "calendario"]):
             return ChatService._handle_date_questions(colombia_time)
         
-        # === 4. PREGUNTAS SOBRE HUMEDAD ===
+        # === 5. PREGUNTAS SOBRE HUMEDAD ===
         elif any(word in content_lower for word in ["humedad", "humidity", "húmedo", "humedo", "vapor"]):
             return await ChatService._handle_humidity_questions(content_lower, colombia_time)
         
-        # === 5. PREGUNTAS COMPARATIVAS ===
+        # === 6. PREGUNTAS COMPARATIVAS ===
         elif any(word in content_lower for word in ["comparar", "compare", "diferencia", "más calor", "mas calor", "más frío", "mas frio", "versus", "vs", "entre"]):
             return await ChatService._handle_comparison_questions(content_lower, colombia_time)
         
-        # === 6. PREGUNTAS DE SALUDO ===
+        # === 7. PREGUNTAS DE SALUDO ===
         elif any(word in content_lower for word in ["hola", "hello", "hi", "hey", "buenos días", "buenas tardes", "buenas noches", "saludos"]):
             return ChatService._handle_greeting(colombia_time)
         
-        # === 7. PREGUNTAS SOBRE AYUDA/COMANDOS ===
+        # === 8. PREGUNTAS SOBRE AYUDA/COMANDOS ===
         elif any(word in content_lower for word in ["ayuda", "help", "que puedes hacer", "qué puedes hacer", "comandos", "opciones", "menu", "menú"]):
             return ChatService._get_help_message(colombia_time)
         
-        # === 8. PREGUNTAS SOBRE UBICACIÓN ===
+        # === 9. PREGUNTAS SOBRE UBICACIÓN ===
         elif any(word in content_lower for word in ["donde", "dónde", "ubicación", "location", "lugar", "ciudad", "coordenadas"]):
             return ChatService._get_location_info(colombia_time)
         
-        # === 9. CONSEJOS DE VESTIMENTA ===
+        # === 10. CONSEJOS DE VESTIMENTA ===
         elif any(word in content_lower for word in ["consejo", "recomendación", "que llevar", "qué llevar", "vestir", "ropa", "outfit"]):
             return await ChatService._handle_clothing_advice(content_lower, colombia_time)
         
-        # === 10. PREGUNTAS SOBRE EL SISTEMA ===
+        # === 11. PREGUNTAS SOBRE EL SISTEMA ===
         elif any(word in content_lower for word in ["robot", "sistema", "como funciona", "cómo funciona", "tecnología", "api"]):
             return ChatService._get_system_info(colombia_time)
         
-        # === 11. PREGUNTAS SOBRE SALUD/ACTIVIDADES ===
+        # === 12. PREGUNTAS SOBRE SALUD/ACTIVIDADES ===
         elif any(word in content_lower for word in ["ejercicio", "deporte", "correr", "caminar", "salir", "actividad"]):
             return await ChatService._handle_activity_suggestions(content_lower, colombia_time)
         
-        # === 12. PREGUNTAS SOBRE PRONÓSTICO ===
-        elif any(word in content_lower for word in ["pronóstico", "pronostico", "mañana", "después", "luego", "futuro"]):
-            return {
-                "type": "chat_response",
-                "message": "🔮 **Pronóstico:** Actualmente solo proporciono datos en tiempo real. Para pronósticos, consulta:\n• IDEAM (Colombia): www.ideam.gov.co\n• Weather.com\n• AccuWeather\n\n¿Te ayudo con el clima actual?",
-                "timestamp": colombia_time.isoformat()
-            }
-        
         # === 13. PREGUNTAS MATEMÁTICAS SIMPLES ===
         elif any(word in content_lower for word in ["suma", "resta", "diferencia de temperatura", "cuanto es", "cuánto es", "calcular"]):
             return await ChatService._handle_weather_calculations(content_lower, colombia_time)
@@ -88,7 +116,11 @@ class ChatService:
         elif any(word in content_lower for word in ["máximo", "maximo", "mínimo", "minimo", "record", "récord", "extremo"]):
             return {
                 "type": "chat_response",
-                "message": f"🌡️ **Temperaturas históricas:**\n🏔️ **Bogotá**: Promedio {settings.CITIES['bogota']['avg_temp_range']} (altitud {settings.CITIES['bogota']['altitude']}m)\n🌺 **Medellín**: Promedio {settings.CITIES['medellin']['avg_temp_range']} (altitud {settings.CITIES['medellin']['altitude']}m)\n\n📊 Para datos históricos detallados, consulta IDEAM.\n¿Te ayudo con las temperaturas actuales?",
+                "message": "🌡️ **Temperaturas históricas:**\n" + "\n".join(
+                    f"{settings.CITIES[city]['emoji']} **{settings.CITIES[city]['name']}**: Promedio {settings.CITIES[city]['avg_temp_range']} (altitud {settings.CITIES[city]['altitude']}m)"
+                    for city in ChatService._summary_cities()
+                    if settings.CITIES[city].get("avg_temp_range") and settings.CITIES[city].get("altitude") is not None
+                ) + "\n\n📊 Para datos históricos detallados, consulta IDEAM.\n¿Te ayudo con las temperaturas actuales?",
                 "timestamp": colombia_time.isoformat()
             }
         
@@ -99,50 +131,142 @@ class ChatService:
     # === MÉTODOS PRIVADOS PARA MANEJAR CADA TIPO DE PREGUNTA ===
     
     @staticmethod
-    async def _handle_weather_questions(content_lower: str, colombia_time) -> dict:
-        """Maneja preguntas específicas sobre clima"""
-        if "bogota" in content_lower or "bogotá" in content_lower:
-            weather = await WeatherService.get_weather_data("bogota")
+    def _find_coordinates(content_lower: str) -> Optional[Tuple[float, float]]:
+        """Extrae coordenadas decimales (lat, lon) del mensaje si las hay y se habla de una ubicación"""
+        match = COORDINATES_PATTERN.search(content_lower)
+        if not match or not COORDINATES_CONTEXT.search(content_lower):
+            return None
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return None
+        return lat, lon
+
+    @staticmethod
+    async def _handle_nearest_station(lat: float, lon: float, colombia_time) -> dict:
+        """Responde con el clima de la estación monitoreada más cercana a unas coordenadas"""
+        nearest = station_index.nearest(lat, lon, k=3)
+        if not nearest:
             return {
                 "type": "chat_response",
-                "message": f"""🏔️ **Clima en Bogotá:**
+                "message": "📍 No hay estaciones monitoreadas registradas en este momento.",
+                "timestamp": colombia_time.isoformat()
+            }
+        
+        city, distance = nearest[0]
+        weather = await WeatherService.get_weather_data(city)
+        others = "\n".join(
+            f"   • {settings.CITIES[other]['name']}: {other_distance:.1f} km"
+            for other, other_distance in nearest[1:]
+        )
+        
+        return {
+            "type": "chat_response",
+            "message": f"""📍 **Estación más cercana a {lat}, {lon}:**
+{weather.emoji} **{weather.name}** a {distance:.1f} km
 🌡️ **Temperatura:** {weather.temperature}°C
 🌤️ **Condición:** {weather.description}
 💧 **Humedad:** {weather.humidity}%
-🕐 **Actualizado:** {weather.time}
-📡 **Fuente:** {weather.source}
-🏔️ **Altitud:** {weather.altitude} metros sobre el nivel del mar""",
-                "timestamp": colombia_time.isoformat()
-            }
-        elif "medellin" in content_lower or "medellín" in content_lower:
-            weather = await WeatherService.get_weather_data("medellin")  
+🕐 **Actualizado:** {weather.time}""" + (f"\n\n🗺️ **Otras estaciones cercanas:**\n{others}" if others else ""),
+            "timestamp": colombia_time.isoformat()
+        }
+    
+    @staticmethod
+    def _mentioned_cities(content_lower: str) -> List[str]:
+        """Ciudades registradas mencionadas en el mensaje (por nombre o clave), en orden de aparición"""
+        return city_registry.find_in_text(content_lower)
+
+    @staticmethod
+    def _summary_cities() -> List[str]:
+        """Ciudades usadas en los resúmenes cuando la pregunta no menciona ninguna"""
+        managed = city_registry.managed
+        return [city for city in settings.CITIES if city in managed][:SUMMARY_MAX_CITIES]
+
+    @staticmethod
+    async def _get_summary_weather() -> List[WeatherData]:
+        """Clima actual de las ciudades del resumen"""
+        return list(await asyncio.gather(*(WeatherService.get_weather_data(city) for city in ChatService._summary_cities())))
+
+    @staticmethod
+    async def _get_comparison_pair(content_lower: str) -> Optional[Tuple[WeatherData, WeatherData]]:
+        """Las dos ciudades a comparar: las mencionadas, completadas con las del resumen"""
+        cities = list(dict.fromkeys(ChatService._mentioned_cities(content_lower) + ChatService._summary_cities()))[:2]
+        if len(cities) < 2:
+            return None
+        first, second = await asyncio.gather(*(WeatherService.get_weather_data(city) for city in cities))
+        return first, second
+
+    @staticmethod
+    def _join_names(names: List[str]) -> str:
+        """Une nombres en español: 'a', 'a y b', 'a, b y c'"""
+        if len(names) <= 1:
+            return "".join(names)
+        return f"{', '.join(names[:-1])} y {names[-1]}"
+
+    @staticmethod
+    def _robot_intervals_text() -> str:
+        """Intervalos base de los robots, p. ej. '15s (Bogotá) y 20s (Medellín)'"""
+        cities = [city for city in ChatService._summary_cities() if city in settings.ROBOT_INTERVALS]
+        parts = [f"{settings.ROBOT_INTERVALS[city]:g}s ({settings.CITIES[city]['name']})" for city in cities]
+        remaining = len(settings.ROBOT_INTERVALS) - len(cities)
+        if remaining > 0:
+            parts.append(f"{remaining} estaciones más")
+        return ChatService._join_names(parts)
+
+    @staticmethod
+    def _no_cities_response(colombia_time) -> dict:
+        """Respuesta cuando no hay ciudades registradas para responder"""
+        return {
+            "type": "chat_response",
+            "message": "📍 No hay suficientes ciudades monitoreadas registradas en este momento.",
+            "timestamp": colombia_time.isoformat()
+        }
+
+    @staticmethod
+    def _which_city_response(topic: str, colombia_time) -> dict:
+        """Pregunta por la ciudad cuando no se pudo resolver ninguna"""
+        names = [settings.CITIES[city]["name"] for city in ChatService._summary_cities()]
+        if not names:
+            return ChatService._no_cities_response(colombia_time)
+        return {
+            "type": "chat_response",
+            "message": f"📍 ¿De qué ciudad quieres {topic}? Prueba con: {', '.join(names)}",
+            "timestamp": colombia_time.isoformat()
+        }
+
+    @staticmethod
+    async def _handle_weather_questions(content_lower: str, colombia_time) -> dict:
+        """Maneja preguntas específicas sobre clima"""
+        mentioned = ChatService._mentioned_cities(content_lower)
+        if mentioned:
+            weather = await WeatherService.get_weather_data(mentioned[0])
+            altitude = f"\n🏔️ **Altitud:** {weather.altitude} metros sobre el nivel del mar" if weather.altitude is not None else ""
             return {
                 "type": "chat_response",
-                "message": f"""🌺 **Clima en Medellín:**
+                "message": f"""{weather.emoji} **Clima en {weather.name}:**
 🌡️ **Temperatura:** {weather.temperature}°C
 🌤️ **Condición:** {weather.description}
 💧 **Humedad:** {weather.humidity}%
 🕐 **Actualizado:** {weather.time}
-📡 **Fuente:** {weather.source}
-🌸 **Altitud:** {weather.altitude} metros sobre el nivel del mar""",
+📡 **Fuente:** {weather.source}""" + altitude,
                 "timestamp": colombia_time.isoformat()
             }
         else:
-            bogota = await WeatherService.get_weather_data("bogota")
-            medellin = await WeatherService.get_weather_data("medellin")
+            readings = await ChatService._get_summary_weather()
+            if not readings:
+                return ChatService._no_cities_response(colombia_time)
+            sections = "\n\n".join(
+                f"""{weather.emoji} **{weather.name.upper()}:**
+   🌡️ {weather.temperature}°C - {weather.description}
+   💧 Humedad: {weather.humidity}%"""
+                for weather in readings
+            )
             return {
                 "type": "chat_response",
                 "message": f"""🌤️ **Reporte climático completo:**
 
-🏔️ **BOGOTÁ:**
-   🌡️ {bogota.temperature}°C - {bogota.description}
-   💧 Humedad: {bogota.humidity}%
-
-🌺 **MEDELLÍN:**
-   🌡️ {medellin.temperature}°C - {medellin.description}
-   💧 Humedad: {medellin.humidity}%
+{sections}
 
-🕐 **Actualizado:** {bogota.time} (Colombia)""",
+🕐 **Actualizado:** {readings[0].time} (Colombia)""",
                 "timestamp": colombia_time.isoformat()
             }
 
@@ -166,59 +290,60 @@ class ChatService:
     @staticmethod
     async def _handle_humidity_questions(content_lower: str, colombia_time) -> dict:
         """Maneja preguntas específicas sobre humedad"""
-        if "bogota" in content_lower or "bogotá" in content_lower:
-            weather = await WeatherService.get_weather_data("bogota")
+        mentioned = ChatService._mentioned_cities(content_lower)
+        if mentioned:
+            weather = await WeatherService.get_weather_data(mentioned[0])
             humidity_level = get_humidity_description(weather.humidity)
             return {
                 "type": "chat_response",
-                "message": f"💧 **Humedad en Bogotá:** {weather.humidity}%\n📊 **Nivel:** {humidity_level}\n🌡️ **Temperatura:** {weather.temperature}°C",
-                "timestamp": colombia_time.isoformat()
-            }
-        elif "medellin" in content_lower or "medellín" in content_lower:
-            weather = await WeatherService.get_weather_data("medellin")
-            humidity_level = get_humidity_description(weather.humidity)
-            return {
-                "type": "chat_response",
-                "message": f"💧 **Humedad en Medellín:** {weather.humidity}%\n📊 **Nivel:** {humidity_level}\n🌡️ **Temperatura:** {weather.temperature}°C",
+                "message": f"💧 **Humedad en {weather.name}:** {weather.humidity}%\n📊 **Nivel:** {humidity_level}\n🌡️ **Temperatura:** {weather.temperature}°C",
                 "timestamp": colombia_time.isoformat()
             }
         else:
-            bogota = await WeatherService.get_weather_data("bogota")
-            medellin = await WeatherService.get_weather_data("medellin")
+            readings = await ChatService._get_summary_weather()
+            if not readings:
+                return ChatService._no_cities_response(colombia_time)
+            lines = "\n".join(
+                f"{weather.emoji} **{weather.name}:** {weather.humidity}% - {get_humidity_description(weather.humidity)}"
+                for weather in readings
+            )
             return {
                 "type": "chat_response",
-                "message": f"""💧 **Comparación de humedad:**
-🏔️ **Bogotá:** {bogota.humidity}% - {get_humidity_description(bogota.humidity)}
-🌺 **Medellín:** {medellin.humidity}% - {get_humidity_description(medellin.humidity)}""",
+                "message": f"💧 **Comparación de humedad:**\n{lines}",
                 "timestamp": colombia_time.isoformat()
             }
 
     @staticmethod
     async def _handle_comparison_questions(content_lower: str, colombia_time) -> dict:
         """Maneja preguntas comparativas entre ciudades"""
-        bogota = await WeatherService.get_weather_data("bogota")
-        medellin = await WeatherService.get_weather_data("medellin")
+        pair = await ChatService._get_comparison_pair(content_lower)
+        if pair is None:
+            return ChatService._no_cities_response(colombia_time)
+        first, second = pair
         
-        temp_diff = abs(bogota.temperature - medellin.temperature)
-        humidity_diff = abs(bogota.humidity - medellin.humidity)
+        temp_diff = abs(first.temperature - second.temperature)
+        humidity_diff = abs(first.humidity - second.humidity)
         
-        warmer_city = "Medellín 🌺" if medellin.temperature > bogota.temperature else "Bogotá 🏔️"
-        more_humid_city = "Medellín 🌺" if medellin.humidity > bogota.humidity else "Bogotá 🏔️"
+        warmer = second if second.temperature > first.temperature else first
+        more_humid = second if second.humidity > first.humidity else first
+        altitude_text = (
+            f"\n🏔️ **Diferencia de altitud:** {abs(first.altitude - second.altitude):,} metros"
+            if first.altitude is not None and second.altitude is not None else ""
+        )
         
         return {
             "type": "chat_response",
             "message": f"""📊 **Comparación climática detallada:**
 
 🌡️ **Temperatura:**
-   • {warmer_city} está {temp_diff}°C más caliente
-   • Bogotá: {bogota.temperature}°C | Medellín: {medellin.temperature}°C
+   • {warmer.name} {warmer.emoji} está {temp_diff}°C más caliente
+   • {first.name}: {first.temperature}°C | {second.name}: {second.temperature}°C
 
 💧 **Humedad:**
-   • {more_humid_city} es {humidity_diff}% más húmeda
-   • Bogotá: {bogota.humidity}% | Medellín: {medellin.humidity}%
-
-🏔️ **Diferencia de altitud:** 1,145 metros
-🕐 **Actualizado:** {bogota.time}""",
+   • {more_humid.name} {more_humid.emoji} es {humidity_diff}% más húmeda
+   • {first.name}: {first.humidity}% | {second.name}: {second.humidity}%
+{altitude_text}
+🕐 **Actualizado:** {first.time}""",
             "timestamp": colombia_time.isoformat()
         }
 
@@ -243,7 +368,7 @@ class ChatService:
 🤖 Soy tu **Asistente Meteorológico Inteligente** para Colombia.
 
 🎯 **¿En qué puedo ayudarte?**
-• 🌡️ Clima actual de Bogotá y Medellín
+• 🌡️ Clima actual de {ChatService._join_names([settings.CITIES[city]['name'] for city in ChatService._summary_cities()])}
 • 💧 Niveles de humedad
 • 📊 Comparaciones entre ciudades
 • 👕 Recomendaciones de vestimenta
@@ -275,6 +400,10 @@ class ChatService:
 • "¿Dónde hace más calor?"
 • "¿Cuál es la diferencia de temperatura?"
 
+🔮 **PRONÓSTICO:**
+• "¿Cuál es el pronóstico para Bogotá?"
+• "¿Cómo estará mañana en Medellín?"
+
 🕐 **TIEMPO:**
 • "¿Qué hora es?"
 • "¿Qué día es hoy?"
@@ -300,28 +429,33 @@ class ChatService:
     @staticmethod
     def _get_location_info(colombia_time) -> dict:
         """Proporciona información detallada de ubicaciones"""
-        bogota_info = settings.CITIES["bogota"]
-        medellin_info = settings.CITIES["medellin"]
+        cities = ChatService._summary_cities()
+        if not cities:
+            return ChatService._no_cities_response(colombia_time)
         
+        sections = []
+        for city in cities:
+            city_info = settings.CITIES[city]
+            profile = CITY_PROFILES.get(city, {})
+            region = f" ({profile['region']})" if "region" in profile else ""
+            lines = [f"{city_info['emoji']} **{city_info['name'].upper()}{region}:**"]
+            lines.append(f"   • **Coordenadas:** {city_info['lat']}°N, {city_info['lon']}°W")
+            if city_info.get("altitude") is not None:
+                lines.append(f"   • **Altitud:** {city_info['altitude']} metros sobre el nivel del mar")
+            if "population" in profile:
+                lines.append(f"   • **Población:** {profile['population']}")
+            if "climate" in profile:
+                lines.append(f"   • **Clima:** {profile['climate']}")
+            if city_info.get("avg_temp_range"):
+                lines.append(f"   • **Temperatura promedio:** {city_info['avg_temp_range']}")
+            sections.append("\n".join(lines))
+        
+        scope = "Ambas ciudades están" if len(cities) == 2 else "Todas las ciudades están"
         return {
             "type": "chat_response",
-            "message": f"""📍 **INFORMACIÓN DE UBICACIONES MONITOREADAS**
-
-🏔️ **BOGOTÁ (Distrito Capital):**
-   • **Coordenadas:** {bogota_info['lat']}°N, {bogota_info['lon']}°W
-   • **Altitud:** {bogota_info['altitude']} metros sobre el nivel del mar
-   • **Población:** ~8 millones (área metropolitana)
-   • **Clima:** Subtropical de altitud (frío de montaña)
-   • **Temperatura promedio:** {bogota_info['avg_temp_range']}
-
-🌺 **MEDELLÍN (Antioquia):**
-   • **Coordenadas:** {medellin_info['lat']}°N, {medellin_info['lon']}°W
-   • **Altitud:** {medellin_info['altitude']} metros sobre el nivel del mar
-   • **Población:** ~4 millones (área metropolitana)
-   • **Clima:** Tropical de montaña (eterna primavera)
-   • **Temperatura promedio:** {medellin_info['avg_temp_range']}
-
-🌍 **Ambas ciudades están en zona horaria UTC-5**
+            "message": "📍 **INFORMACIÓN DE UBICACIONES MONITOREADAS**\n\n" + "\n\n".join(sections) + f"""
+
+🌍 **{scope} en zona horaria UTC-5**
 📡 **Datos obtenidos en tiempo real de OpenWeatherMap API**""",
             "timestamp": colombia_time.isoformat()
         }
@@ -329,45 +463,32 @@ class ChatService:
     @staticmethod
     async def _handle_clothing_advice(content_lower: str, colombia_time) -> dict:
         """Proporciona consejos personalizados de vestimenta"""
-        if "bogota" in content_lower or "bogotá" in content_lower:
-            weather = await WeatherService.get_weather_data("bogota")
-            advice = get_detailed_clothing_advice(weather.temperature, weather.humidity, "bogota")
+        mentioned = ChatService._mentioned_cities(content_lower)
+        if mentioned:
+            weather = await WeatherService.get_weather_data(mentioned[0])
+            advice = get_detailed_clothing_advice(weather.temperature, weather.humidity, weather.city)
             return {
                 "type": "chat_response",
-                "message": f"""👕 **RECOMENDACIÓN PARA BOGOTÁ**
+                "message": f"""👕 **RECOMENDACIÓN PARA {weather.name.upper()}**
 🌡️ **Temperatura:** {weather.temperature}°C
 💧 **Humedad:** {weather.humidity}%
 
-{advice}""",
-                "timestamp": colombia_time.isoformat()
-            }
-        elif "medellin" in content_lower or "medellín" in content_lower:
-            weather = await WeatherService.get_weather_data("medellin")
-            advice = get_detailed_clothing_advice(weather.temperature, weather.humidity, "medellin")
-            return {
-                "type": "chat_response",
-                "message": f"""👕 **RECOMENDACIÓN PARA MEDELLÍN**
-🌡️ **Temperatura:** {weather.temperature}°C  
-💧 **Humedad:** {weather.humidity}%
-
 {advice}""",
                 "timestamp": colombia_time.isoformat()
             }
         else:
-            bogota = await WeatherService.get_weather_data("bogota")
-            medellin = await WeatherService.get_weather_data("medellin")
-            advice_bog = get_detailed_clothing_advice(bogota.temperature, bogota.humidity, "bogota")
-            advice_med = get_detailed_clothing_advice(medellin.temperature, medellin.humidity, "medellin")
+            readings = await ChatService._get_summary_weather()
+            if not readings:
+                return ChatService._no_cities_response(colombia_time)
+            sections = "\n\n".join(
+                f"{weather.emoji} **{weather.name.upper()} ({weather.temperature}°C):**\n"
+                + get_detailed_clothing_advice(weather.temperature, weather.humidity, weather.city)
+                for weather in readings
+            )
             
             return {
                 "type": "chat_response",
-                "message": f"""👕 **RECOMENDACIONES DE VESTIMENTA**
-
-🏔️ **BOGOTÁ ({bogota.temperature}°C):**
-{advice_bog}
-
-🌺 **MEDELLÍN ({medellin.temperature}°C):**
-{advice_med}""",
+                "message": f"👕 **RECOMENDACIONES DE VESTIMENTA**\n\n{sections}",
                 "timestamp": colombia_time.isoformat()
             }
 
@@ -385,7 +506,7 @@ class ChatService:
 • Comunicación: WebSocket en tiempo real
 
 🔄 **Funcionamiento:**
-• Los robots obtienen datos cada {settings.ROBOT_INTERVALS['bogota']}s (Bogotá) y {settings.ROBOT_INTERVALS['medellin']}s (Medellín)
+• Los robots obtienen datos cada {ChatService._robot_intervals_text()}, ajustando el intervalo según la variabilidad del clima
 • Datos reales de temperatura, humedad y condiciones
 • Sistema de fallback a datos simulados
 • Zona horaria de Colombia (UTC-5)
@@ -408,57 +529,81 @@ class ChatService:
     @staticmethod
     async def _handle_activity_suggestions(content_lower: str, colombia_time) -> dict:
         """Proporciona sugerencias de actividades según el clima"""
-        if "bogota" in content_lower or "bogotá" in content_lower:
-            weather = await WeatherService.get_weather_data("bogota")
-            suggestions = get_activity_suggestions(weather.temperature, weather.humidity, weather.description, "bogota")
+        mentioned = ChatService._mentioned_cities(content_lower)
+        if mentioned:
+            weather = await WeatherService.get_weather_data(mentioned[0])
+            suggestions = get_activity_suggestions(weather.temperature, weather.humidity, weather.description, weather.city)
             return {
                 "type": "chat_response",
-                "message": f"""🏃 **ACTIVIDADES RECOMENDADAS PARA BOGOTÁ**
-🌡️ **Condiciones:** {weather.temperature}°C, {weather.description}
-
-{suggestions}""",
-                "timestamp": colombia_time.isoformat()
-            }
-        elif "medellin" in content_lower or "medellín" in content_lower:
-            weather = await WeatherService.get_weather_data("medellin")
-            suggestions = get_activity_suggestions(weather.temperature, weather.humidity, weather.description, "medellin")
-            return {
-                "type": "chat_response",
-                "message": f"""🏃 **ACTIVIDADES RECOMENDADAS PARA MEDELLÍN**  
+                "message": f"""🏃 **ACTIVIDADES RECOMENDADAS PARA {weather.name.upper()}**
 🌡️ **Condiciones:** {weather.temperature}°C, {weather.description}
 
 {suggestions}""",
                 "timestamp": colombia_time.isoformat()
             }
         else:
-            bogota = await WeatherService.get_weather_data("bogota")
-            medellin = await WeatherService.get_weather_data("medellin")
-            
-            suggestions_bog = get_activity_suggestions(bogota.temperature, bogota.humidity, bogota.description, "bogota")
-            suggestions_med = get_activity_suggestions(medellin.temperature, medellin.humidity, medellin.description, "medellin")
+            readings = await ChatService._get_summary_weather()
+            if not readings:
+                return ChatService._no_cities_response(colombia_time)
+            sections = "\n\n".join(
+                f"{weather.emoji} **{weather.name.upper()} ({weather.temperature}°C):**\n"
+                + get_activity_suggestions(weather.temperature, weather.humidity, weather.description, weather.city)
+                for weather in readings
+            )
             
             return {
                 "type": "chat_response",
-                "message": f"""🏃 **ACTIVIDADES RECOMENDADAS**
-
-🏔️ **BOGOTÁ ({bogota.temperature}°C):**
-{suggestions_bog}
-
-🌺 **MEDELLÍN ({medellin.temperature}°C):**
-{suggestions_med}""",
+                "message": f"🏃 **ACTIVIDADES RECOMENDADAS**\n\n{sections}",
                 "timestamp": colombia_time.isoformat()
             }
 
+    @staticmethod
+    async def _handle_forecast_questions(content_lower: str, colombia_time) -> dict:
+        """Responde pronósticos desde el almacén de pronósticos (sin llamadas extra a la API)"""
+        mentioned = ChatService._mentioned_cities(content_lower)
+        cities = mentioned[:1] or ChatService._summary_cities()
+        
+        tomorrow = (colombia_time + timedelta(days=1)).date().isoformat()
+        sections = []
+        for city in cities:
+            forecast = await WeatherService.get_forecast(city)
+            city_info = settings.CITIES[city]
+            if forecast is None:
+                continue
+            
+            next_hours = forecast.hourly(since=colombia_time.timestamp(), limit=12)[::3]
+            hours_text = "\n".join(
+                f"   • {hour['time'][11:16]}: {round(hour['temperature'])}°C, {hour['description']}"
+                for hour in next_hours
+            )
+            day = next((day for day in forecast.daily() if day["date"] == tomorrow), None)
+            tomorrow_text = (
+                f"   📅 **Mañana:** {round(day['min_temperature'])}-{round(day['max_temperature'])}°C, "
+                f"{day['description']}, 💧 {day['avg_humidity']}%"
+                if day else "   📅 **Mañana:** sin datos disponibles"
+            )
+            sections.append(f"{city_info['emoji']} **{city_info['name'].upper()}:**\n{hours_text}\n{tomorrow_text}")
+        
+        if not sections:
+            return ChatService._which_city_response("el pronóstico", colombia_time)
+        return {
+            "type": "chat_response",
+            "message": "🔮 **PRONÓSTICO**\n\n" + "\n\n".join(sections),
+            "timestamp": colombia_time.isoformat()
+        }
+
     @staticmethod
     async def _handle_weather_calculations(content_lower: str, colombia_time) -> dict:
         """Maneja cálculos simples relacionados con el clima"""
-        bogota = await WeatherService.get_weather_data("bogota")
-        medellin = await WeatherService.get_weather_data("medellin")
+        pair = await ChatService._get_comparison_pair(content_lower)
+        if pair is None:
+            return ChatService._no_cities_response(colombia_time)
+        first, second = pair
         
-        temp_diff = abs(bogota.temperature - medellin.temperature)
-        temp_avg = round((bogota.temperature + medellin.temperature) / 2, 1)
-        humidity_diff = abs(bogota.humidity - medellin.humidity)
-        humidity_avg = round((bogota.humidity + medellin.humidity) / 2, 1)
+        temp_diff = abs(first.temperature - second.temperature)
+        temp_avg = round((first.temperature + second.temperature) / 2, 1)
+        humidity_diff = abs(first.humidity - second.humidity)
+        humidity_avg = round((first.humidity + second.humidity) / 2, 1)
         
         return {
             "type": "chat_response",
@@ -467,16 +612,16 @@ class ChatService:
 🌡️ **Temperaturas:**
 • Diferencia: {temp_diff}°C
 • Promedio: {temp_avg}°C
-• Bogotá: {bogota.temperature}°C | Medellín: {medellin.temperature}°C
+• {first.name}: {first.temperature}°C | {second.name}: {second.temperature}°C
 
 💧 **Humedad:**
 • Diferencia: {humidity_diff}%
 • Promedio: {humidity_avg}%
-• Bogotá: {bogota.humidity}% | Medellín: {medellin.humidity}%
+• {first.name}: {first.humidity}% | {second.name}: {second.humidity}%
 
 📊 **Conversiones útiles:**
-• Bogotá en Fahrenheit: {round(bogota.temperature * 9/5 + 32, 1)}°F
-• Medellín en Fahrenheit: {round(medellin.temperature * 9/5 + 32, 1)}°F""",
+• {first.name} en Fahrenheit: {round(first.temperature * 9/5 + 32, 1)}°F
+• {second.name} en Fahrenheit: {round(second.temperature * 9/5 + 32, 1)}°F""",
             "timestamp": colombia_time.isoformat()
         }
 
@@ -0,0 +1,102 @@
+"""
+Circuit breakers for upstream weather providers
+"""
+import logging
+import time
+from typing import Dict
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Trips after repeated failures and short-circuits calls until a probe succeeds"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream (at most one probe while half-open)"""
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            logger.info(f"🔌 Circuit {self.name} half-open, probing upstream")
+
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self.short_circuited += 1
+        return False
+
+    def record_success(self):
+        """Record a successful upstream call"""
+        if self.state != self.CLOSED:
+            logger.info(f"✅ Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed upstream call, opening the circuit when the threshold is hit"""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"⚡ Circuit {self.name} opened after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Release a half-open probe whose call was cancelled before completing"""
+        self._probe_in_flight = False
+
+    def seconds_until_retry(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def get_stats(self) -> dict:
+        """Get breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "short_circuited": self.short_circuited,
+            "retry_in_seconds": round(self.seconds_until_retry(), 1)
+        }
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per upstream provider"""
+
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, provider: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a provider"""
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(
+                provider,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+            )
+        return self.breakers[provider]
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Get the state of every provider breaker"""
+        return {name: breaker.get_stats() for name, breaker in self.breakers.items()}
+
+# Global circuit breaker registry instance
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,234 @@
+"""
+Runtime registry of monitored cities, persisted to a local JSON file
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.settings import settings
+from app.services.station_index import station_index
+from app.services.robot_service import robot_service
+from app.services.weather_cache import weather_cache
+from app.services.forecast_store import forecast_store
+from app.services.change_detector import change_detector
+from app.services.adaptive_polling import adaptive_polling
+from app.services.weather_delta import delta_encoder
+from app.services.simulation import SYNTHETIC_CITY_PREFIX, is_synthetic_city
+
+logger = logging.getLogger(__name__)
+
+CITY_KEY_PATTERN = re.compile(r"^[a-z0-9_]{2,40}$")
+CITY_FIELDS = ("name", "lat", "lon", "emoji", "altitude", "avg_temp_range", "owm_id")
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so 'Bogotá' matches 'bogota'"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def is_number(value: Any) -> bool:
+    """Check for an int or float (bools are not coordinates)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class CityRegistry:
+    """Owns settings.CITIES and settings.ROBOT_INTERVALS at runtime.
+
+    Changes are applied in place (so every existing lookup sees them), pushed
+    to the station index and the robot scheduler, and written atomically to
+    CITY_REGISTRY_FILE. Other worker processes pick changes up by watching
+    the file's modification time. Generated stations are regenerated at
+    startup and never persisted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = 0.0
+        self._names: Optional[List[Tuple[str, str]]] = None
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def load(self):
+        """Replace the configured cities with the persisted registry, if one exists"""
+        cities = self._read()
+        if cities is None:
+            logger.info(f"🏙️ No usable city registry file, using {len(self.managed)} current cities")
+            return
+        for city in list(self.managed):
+            if city not in cities:
+                self._drop(city)
+        for city, info in cities.items():
+            try:
+                self._validate(info)
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"⚠️ Skipping invalid city {city} in {self.path}: {e}")
+                continue
+            self._apply(city, info)
+        logger.info(f"🏙️ Loaded {len(cities)} cities from {self.path}")
+
+    @property
+    def managed(self) -> Set[str]:
+        """Registered cities owned by the registry file (everything except generated stations)"""
+        return {city for city in settings.CITIES if not is_synthetic_city(city)}
+
+    def exists(self, city: str) -> bool:
+        """Check whether a city is registered"""
+        return city in settings.CITIES
+
+    def get(self, city: str) -> Optional[Dict[str, Any]]:
+        """Get a city's info including its base robot interval"""
+        if city not in settings.CITIES:
+            return None
+        return {"city": city, **settings.CITIES[city], "interval": settings.ROBOT_INTERVALS.get(city)}
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Get every registered city"""
+        return [self.get(city) for city in settings.CITIES]
+
+    def add(self, city: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a new city and start its robot"""
+        if not CITY_KEY_PATTERN.match(city):
+            raise ValueError("City key must be 2-40 lowercase letters, digits or underscores")
+        if city in settings.CITIES:
+            raise ValueError(f"City '{city}' already exists")
+        if is_synthetic_city(city):
+            raise ValueError(f"City keys starting with '{SYNTHETIC_CITY_PREFIX}' are reserved for generated stations")
+        self._validate(info)
+        self._apply(city, info)
+        self.save()
+        logger.info(f"🏙️ City {city} added")
+        return self.get(city)
+
+    def update(self, city: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a city's fields and/or robot interval"""
+        info = {**settings.CITIES[city], "interval": settings.ROBOT_INTERVALS.get(city), **changes}
+        self._validate(info)
+        self._apply(city, info)
+        self.save()
+        logger.info(f"🏙️ City {city} updated")
+        return self.get(city)
+
+    def remove(self, city: str):
+        """Unregister a city and stop its robot"""
+        self._drop(city)
+        self.save()
+        logger.info(f"🏙️ City {city} removed")
+
+    def find_in_text(self, text: str) -> List[str]:
+        """Keys of the cities mentioned by name or key in free text, in order of appearance"""
+        normalized = normalize_text(text)
+        taken: List[Tuple[int, int, str]] = []
+        for city, name in self._name_index():
+            for match in re.finditer(rf"\b{re.escape(name)}\b", normalized):
+                # Longer names were matched first, so skip "marta" inside "santa marta"
+                if not any(start < match.end() and match.start() < end for start, end, _ in taken):
+                    taken.append((match.start(), match.end(), city))
+        return list(dict.fromkeys(city for _, _, city in sorted(taken)))
+
+    def save(self):
+        """Write the managed cities to the registry file atomically"""
+        managed = self.managed
+        data = {
+            city: {**settings.CITIES[city], "interval": settings.ROBOT_INTERVALS.get(city)}
+            for city in settings.CITIES if city in managed
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as registry_file:
+            json.dump({"cities": data}, registry_file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def start_watching(self):
+        """Reload the registry when another process rewrites the file"""
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    def stop_watching(self):
+        """Stop watching the registry file"""
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    async def _watch(self):
+        while True:
+            try:
+                await asyncio.sleep(settings.CITY_REGISTRY_POLL_INTERVAL)
+                if os.path.exists(self.path) and os.path.getmtime(self.path) != self._mtime:
+                    self.load()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Error reloading city registry: {e}")
+
+    def _read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, encoding="utf-8") as registry_file:
+                cities = json.load(registry_file)["cities"]
+            if not isinstance(cities, dict):
+                raise ValueError("'cities' must be an object")
+            return cities
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable city registry {self.path}: {e}")
+            return None
+
+    def _validate(self, info: Dict[str, Any]):
+        if not info.get("name"):
+            raise ValueError("City name is required")
+        if not all(is_number(info.get(field)) for field in ("lat", "lon")):
+            raise ValueError("Coordinates must be numbers")
+        if not -90 <= info["lat"] <= 90 or not -180 <= info["lon"] <= 180:
+            raise ValueError("Coordinates out of range")
+        interval = info.get("interval")
+        if interval is not None and (not is_number(interval) or interval <= 0):
+            raise ValueError("Robot interval must be positive")
+
+    def _apply(self, city: str, info: Dict[str, Any]):
+        previous = settings.CITIES.get(city)
+        city_info = {field: info[field] for field in CITY_FIELDS if info.get(field) is not None}
+        city_info.setdefault("emoji", "📍")
+        interval = info.get("interval") or settings.ROBOT_INTERVALS.get(city) or settings.SIMULATION_ROBOT_INTERVAL
+        if previous == city_info and settings.ROBOT_INTERVALS.get(city) == interval:
+            return
+
+        settings.CITIES[city] = city_info
+        settings.ROBOT_INTERVALS[city] = interval
+        self._names = None
+
+        station_index.register(city, city_info["lat"], city_info["lon"])
+        if previous is not None and (previous["lat"], previous["lon"]) != (city_info["lat"], city_info["lon"]):
+            weather_cache.invalidate(city)
+            forecast_store.invalidate(city)
+            adaptive_polling.forget(city)
+            delta_encoder.forget(city)
+        change_detector.forget(city)
+        robot_service.add_robot(city, interval)
+
+    def _drop(self, city: str):
+        robot_service.remove_robot(city)
+        settings.CITIES.pop(city, None)
+        settings.ROBOT_INTERVALS.pop(city, None)
+        self._names = None
+        station_index.remove(city)
+        weather_cache.invalidate(city)
+        forecast_store.invalidate(city)
+        change_detector.forget(city)
+        adaptive_polling.forget(city)
+        delta_encoder.forget(city)
+
+    def _name_index(self) -> List[Tuple[str, str]]:
+        # Longest names first so "santa marta" wins over "marta"
+        if self._names is None:
+            names = {}
+            for city in self.managed:
+                names[normalize_text(settings.CITIES[city]["name"])] = city
+                names.setdefault(city.replace("_", " "), city)
+            self._names = sorted(((city, name) for name, city in names.items()), key=lambda item: -len(item[1]))
+        return self._names
+
+# Global city registry instance
+city_registry = CityRegistry(path=settings.CITY_REGISTRY_FILE)
@@ -0,0 +1,71 @@
+"""
+Per-city forecast store refreshed at most once per refresh window
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+
+logger = logging.getLogger(__name__)
+
+ForecastFetcher = Callable[[str], Awaitable[Optional[CityForecast]]]
+
+class ForecastStore:
+    """Keeps one compact forecast per city and shares in-flight refreshes"""
+
+    def __init__(self, refresh_window: float):
+        self.refresh_window = refresh_window
+        self.forecasts: Dict[str, CityForecast] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get_last(self, city: str) -> Optional[CityForecast]:
+        """Get the stored forecast for a city regardless of its age"""
+        return self.forecasts.get(city)
+
+    def invalidate(self, city: str):
+        """Drop the stored forecast for a city"""
+        self.forecasts.pop(city, None)
+
+    async def get_or_fetch(self, city: str, fetcher: ForecastFetcher) -> Optional[CityForecast]:
+        """Return the stored forecast while inside the refresh window, otherwise refresh it once"""
+        forecast = self.forecasts.get(city)
+        if forecast is not None and not forecast.stale and time.time() - forecast.fetched_at < self.refresh_window:
+            self.hits += 1
+            return forecast
+        self.misses += 1
+
+        task = self._inflight.get(city)
+        if task is None:
+            task = asyncio.create_task(self._refresh(city, fetcher))
+            self._inflight[city] = task
+        return await asyncio.shield(task)
+
+    async def _refresh(self, city: str, fetcher: ForecastFetcher) -> Optional[CityForecast]:
+        try:
+            forecast = await fetcher(city)
+            if forecast is not None and not forecast.stale:
+                self.forecasts[city] = forecast
+                self.refreshes += 1
+                logger.info(f"🔮 Forecast refreshed for {city} ({len(forecast.times)} hours, {forecast.source})")
+            return forecast
+        finally:
+            self._inflight.pop(city, None)
+
+    def get_stats(self) -> dict:
+        """Get store counters"""
+        return {
+            "refresh_window_seconds": self.refresh_window,
+            "cities": len(self.forecasts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "bytes": sum(forecast.nbytes() for forecast in self.forecasts.values())
+        }
+
+# Global forecast store instance
+forecast_store = ForecastStore(refresh_window=settings.FORECAST_REFRESH_WINDOW)
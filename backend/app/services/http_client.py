@@ -0,0 +1,55 @@
+"""
+Shared HTTP client for upstream weather API calls
+"""
+import logging
+from typing import Optional
+import aiohttp
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class HttpClientService:
+    """Lifespan-managed aiohttp session with keep-alive connection pooling"""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Create the pooled session (called from the application lifespan)"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            sock_read=settings.HTTP_READ_TIMEOUT
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        logger.info(
+            f"🌐 HTTP client started (pool {settings.HTTP_POOL_LIMIT}, "
+            f"{settings.HTTP_POOL_LIMIT_PER_HOST}/host, connect {settings.HTTP_CONNECT_TIMEOUT}s, "
+            f"read {settings.HTTP_READ_TIMEOUT}s)"
+        )
+
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("🌐 HTTP client closed")
+        self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it lazily outside the lifespan"""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+# Global HTTP client instance
+http_client = HttpClientService()
@@ -0,0 +1,52 @@
+"""
+Latency histograms for upstream provider calls
+"""
+import bisect
+from typing import List
+
+# Bucket upper bounds in milliseconds (roughly log-spaced)
+LATENCY_BUCKETS_MS: List[float] = [
+    5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 400, 500, 750,
+    1000, 1500, 2000, 3000, 5000, 10000, float("inf")
+]
+
+class LatencyHistogram:
+    """Bucketed latency histogram with periodic decay so percentiles track recent behaviour"""
+
+    def __init__(self, decay_every: int = 1000):
+        self.counts: List[float] = [0.0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0.0
+        self.samples = 0
+        self.decay_every = decay_every
+
+    def record(self, seconds: float):
+        """Record one call duration"""
+        index = bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)
+        self.counts[index] += 1
+        self.total += 1
+        self.samples += 1
+        if self.samples % self.decay_every == 0:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+
+    def percentile(self, p: float) -> float:
+        """Get the approximate p-th percentile in seconds (bucket upper bound)"""
+        if self.total == 0:
+            return 0.0
+        threshold = self.total * p / 100
+        cumulative = 0.0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                # The overflow bucket has no upper bound; report the last finite one
+                return (bound if bound != float("inf") else LATENCY_BUCKETS_MS[-2]) / 1000
+        return LATENCY_BUCKETS_MS[-2] / 1000
+
+    def get_stats(self) -> dict:
+        """Get sample count and headline percentiles in milliseconds"""
+        return {
+            "samples": self.samples,
+            "p50_ms": round(self.percentile(50) * 1000),
+            "p95_ms": round(self.percentile(95) * 1000),
+            "p99_ms": round(self.percentile(99) * 1000)
+        }
@@ -0,0 +1,111 @@
+"""
+File-lock leader election so only one server process runs the robots
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+from app.core.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, every process leads
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class LeaderElection:
+    """Advisory-lock leadership shared by every worker on the host.
+
+    The leader holds an exclusive flock on ROBOT_LEADER_LOCK_FILE for its whole
+    life. The kernel drops the lock when the process exits for any reason, so
+    a follower polling every ROBOT_LEADER_RETRY_INTERVAL seconds takes over
+    automatically if the leader dies.
+    """
+
+    def __init__(self, lock_file: str, retry_interval: float):
+        self.lock_file = lock_file
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, on_elected: Callable[[], Awaitable[None]]):
+        """Try to become leader now, and keep trying in the background until elected"""
+        if not settings.ROBOT_LEADER_ELECTION or fcntl is None:
+            self.is_leader = True
+            await on_elected()
+            return
+
+        if settings.BROKER_BACKEND == "local":
+            logger.error(
+                "❌ ROBOT_LEADER_ELECTION is on but BROKER_BACKEND is local: "
+                "observers connected to follower workers will get no robot updates"
+            )
+
+        if self._try_acquire():
+            await self._become_leader(on_elected)
+        else:
+            logger.info(f"👥 Process {os.getpid()} is a follower, robots run in another worker")
+            self._task = asyncio.create_task(self._wait_for_leadership(on_elected))
+
+    async def stop(self):
+        """Stop campaigning and release leadership"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self.is_leader = False
+
+    async def _wait_for_leadership(self, on_elected: Callable[[], Awaitable[None]]):
+        while True:
+            try:
+                await asyncio.sleep(self.retry_interval)
+                if self._try_acquire():
+                    await self._become_leader(on_elected)
+                    return
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Error in leader election: {e}")
+
+    async def _become_leader(self, on_elected: Callable[[], Awaitable[None]]):
+        self.is_leader = True
+        os.ftruncate(self._fd, 0)
+        os.write(self._fd, f"{os.getpid()}\n".encode())
+        logger.info(f"👑 Process {os.getpid()} elected robot leader")
+        await on_elected()
+
+    def _try_acquire(self) -> bool:
+        if self._fd is None:
+            self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def get_stats(self) -> dict:
+        """Get this process' role and the current leader's pid"""
+        leader_pid = os.getpid() if self.is_leader else None
+        if leader_pid is None:
+            try:
+                with open(self.lock_file) as lock:
+                    leader_pid = int(lock.read().strip() or 0) or None
+            except (OSError, ValueError):
+                pass
+        return {
+            "pid": os.getpid(),
+            "is_leader": self.is_leader,
+            "leader_pid": leader_pid,
+            "lock_file": self.lock_file if fcntl is not None else None
+        }
+
+# Global leader election instance
+leader_election = LeaderElection(
+    lock_file=settings.ROBOT_LEADER_LOCK_FILE,
+    retry_interval=settings.ROBOT_LEADER_RETRY_INTERVAL
+)
@@ -0,0 +1,5 @@
+"""
+Weather providers module.
+
+Contains the pluggable upstream provider interface and its implementations.
+"""
@@ -0,0 +1,76 @@
+"""
+Base interface for upstream weather providers
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+from app.models.weather import WeatherData
+from app.services.latency import LatencyHistogram
+from app.services.quota_scheduler import QuotaScheduler
+from app.utils.helpers import get_colombia_time
+
+class ProviderError(Exception):
+    """Raised when a provider can't return a reading"""
+
+class WeatherProvider(ABC):
+    """Upstream weather data source"""
+
+    name: str = ""
+    source: str = ""
+    real_data: bool = True
+    calls_per_minute: int = 0  # 0 = unlimited
+    calls_per_day: int = 0
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.quota = QuotaScheduler(self.name, self.calls_per_minute, self.calls_per_day)
+        self.wins = 0
+
+    def is_available(self) -> bool:
+        """Whether the provider is configured well enough to be called"""
+        return True
+
+    @abstractmethod
+    async def fetch_location(self, key: str, location: Dict[str, Any]) -> WeatherData:
+        """Fetch the current reading at a location (lat/lon/name/emoji/altitude), raising ProviderError on failure"""
+
+    async def fetch_current(self, city: str) -> WeatherData:
+        """Fetch the current reading for a configured city"""
+        return await self.fetch_location(city, settings.CITIES[city])
+
+    async def fetch_forecast(self, key: str, location: Dict[str, Any]) -> CityForecast:
+        """Fetch the hourly forecast at a location; providers without one raise ProviderError"""
+        raise ProviderError(f"{self.name} does not provide forecasts")
+
+    def request_cost(self, cities: List[str]) -> int:
+        """Number of upstream requests a fetch_batch call for these cities will make"""
+        return len(cities)
+
+    async def fetch_batch(self, cities: List[str]) -> Dict[str, WeatherData]:
+        """Fetch many cities; providers with a bulk endpoint override this"""
+        results = await asyncio.gather(*[self.fetch_current(city) for city in cities], return_exceptions=True)
+        readings = {city: weather for city, weather in zip(cities, results) if isinstance(weather, WeatherData)}
+        if not readings and cities:
+            raise ProviderError(f"{self.name} returned no readings for {len(cities)} cities")
+        return readings
+
+    def build_weather_data(
+        self, key: str, location: Dict[str, Any], temperature: float, humidity: int, description: str
+    ) -> WeatherData:
+        """Build WeatherData for a location from provider values"""
+        colombia_time = get_colombia_time()
+
+        return WeatherData(
+            city=key,
+            name=location["name"],
+            temperature=round(temperature),
+            humidity=humidity,
+            description=description,
+            time=colombia_time.strftime("%H:%M:%S"),
+            emoji=location["emoji"],
+            source=self.source,
+            real_data=self.real_data,
+            altitude=location.get("altitude")
+        )
@@ -0,0 +1,127 @@
+"""
+Open-Meteo weather provider (no API key required)
+"""
+import time
+from typing import Any, Dict, List
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+from app.models.weather import WeatherData
+from app.services.http_client import http_client
+from app.services.providers.base import ProviderError, WeatherProvider
+from app.utils.helpers import chunked
+
+OPEN_METEO_BASE_URL = "https://api.open-meteo.com/v1"
+OPEN_METEO_MAX_LOCATIONS = 100
+
+# WMO weather interpretation codes used by Open-Meteo
+WMO_DESCRIPTIONS: Dict[int, str] = {
+    0: "Cielo Despejado",
+    1: "Mayormente Despejado",
+    2: "Parcialmente Nublado",
+    3: "Nublado",
+    45: "Niebla",
+    48: "Niebla Con Escarcha",
+    51: "Llovizna Ligera",
+    53: "Llovizna",
+    55: "Llovizna Intensa",
+    56: "Llovizna Helada Ligera",
+    57: "Llovizna Helada Intensa",
+    61: "Lluvia Ligera",
+    63: "Lluvia",
+    65: "Lluvia Intensa",
+    66: "Lluvia Helada Ligera",
+    67: "Lluvia Helada Intensa",
+    71: "Nevada Ligera",
+    73: "Nevada",
+    75: "Nevada Intensa",
+    77: "Granos De Nieve",
+    80: "Chubascos Ligeros",
+    81: "Chubascos",
+    82: "Chubascos Fuertes",
+    85: "Chubascos De Nieve Ligeros",
+    86: "Chubascos De Nieve Fuertes",
+    95: "Tormenta",
+    96: "Tormenta Con Granizo",
+    99: "Tormenta Con Granizo Fuerte"
+}
+
+CURRENT_FIELDS = "temperature_2m,relative_humidity_2m,weather_code"
+
+class OpenMeteoProvider(WeatherProvider):
+    """Current weather from Open-Meteo, which accepts many coordinates per request"""
+
+    name = "open_meteo"
+    source = "Open-Meteo API"
+    calls_per_minute = settings.OPEN_METEO_CALLS_PER_MINUTE
+    calls_per_day = settings.OPEN_METEO_CALLS_PER_DAY
+
+    async def fetch_location(self, key: str, location: Dict[str, Any]) -> WeatherData:
+        readings = await self._fetch_locations({key: location})
+        if key not in readings:
+            raise ProviderError(f"Open-Meteo returned no reading for {key}")
+        return readings[key]
+
+    async def fetch_forecast(self, key: str, location: Dict[str, Any]) -> CityForecast:
+        """Hourly forecast for the next FORECAST_HOURS hours"""
+        params = {
+            "latitude": location["lat"],
+            "longitude": location["lon"],
+            "hourly": CURRENT_FIELDS,
+            "forecast_hours": settings.FORECAST_HOURS,
+            "timeformat": "unixtime",
+            "timezone": "UTC"
+        }
+        session = await http_client.get_session()
+        async with session.get(f"{OPEN_METEO_BASE_URL}/forecast", params=params) as response:
+            if response.status != 200:
+                raise ProviderError(f"Open-Meteo API error: {response.status}")
+            data = await response.json()
+
+        hourly = data["hourly"]
+        points = [
+            (timestamp, temperature, round(humidity), WMO_DESCRIPTIONS.get(code, "Condición Desconocida"))
+            for timestamp, temperature, humidity, code in zip(
+                hourly["time"], hourly["temperature_2m"], hourly["relative_humidity_2m"], hourly["weather_code"]
+            )
+            if temperature is not None and humidity is not None
+        ]
+        return CityForecast.from_points(key, self.source, time.time(), points)
+
+    def request_cost(self, cities: List[str]) -> int:
+        return -(-len(cities) // OPEN_METEO_MAX_LOCATIONS)
+
+    async def fetch_batch(self, cities: List[str]) -> Dict[str, WeatherData]:
+        readings: Dict[str, WeatherData] = {}
+        for chunk in chunked(cities, OPEN_METEO_MAX_LOCATIONS):
+            readings.update(await self._fetch_locations({city: settings.CITIES[city] for city in chunk}))
+        return readings
+
+    async def _fetch_locations(self, locations: Dict[str, Dict[str, Any]]) -> Dict[str, WeatherData]:
+        params = {
+            "latitude": ",".join(str(location["lat"]) for location in locations.values()),
+            "longitude": ",".join(str(location["lon"]) for location in locations.values()),
+            "current": CURRENT_FIELDS,
+            "timezone": "America/Bogota"
+        }
+        session = await http_client.get_session()
+        async with session.get(f"{OPEN_METEO_BASE_URL}/forecast", params=params) as response:
+            if response.status != 200:
+                raise ProviderError(f"Open-Meteo API error: {response.status}")
+            data = await response.json()
+
+        # A single location returns an object, several return a list in request order
+        results = data if isinstance(data, list) else [data]
+        return {
+            key: self._parse(key, location, result)
+            for (key, location), result in zip(locations.items(), results)
+        }
+
+    def _parse(self, key: str, location: Dict[str, Any], data: Dict[str, Any]) -> WeatherData:
+        current = data["current"]
+        return self.build_weather_data(
+            key,
+            location,
+            temperature=current["temperature_2m"],
+            humidity=round(current["relative_humidity_2m"]),
+            description=WMO_DESCRIPTIONS.get(current.get("weather_code"), "Condición Desconocida")
+        )
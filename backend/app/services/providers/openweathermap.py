@@ -0,0 +1,110 @@
+"""
+OpenWeatherMap weather provider
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+from app.models.weather import WeatherData
+from app.services.http_client import http_client
+from app.services.providers.base import ProviderError, WeatherProvider
+from app.utils.helpers import chunked
+
+logger = logging.getLogger(__name__)
+
+OPENWEATHER_PUBLIC_URL = "https://api.openweathermap.org/data/2.5"
+
+class OpenWeatherMapProvider(WeatherProvider):
+    """Current weather from OpenWeatherMap (single and group-by-id endpoints)"""
+
+    name = "openweathermap"
+    source = "OpenWeatherMap API"
+    calls_per_minute = settings.OPENWEATHER_CALLS_PER_MINUTE
+    calls_per_day = settings.OPENWEATHER_CALLS_PER_DAY
+
+    def is_available(self) -> bool:
+        # A local stub needs no real key, so only the public API requires one
+        if settings.OPENWEATHER_BASE_URL.rstrip("/") != OPENWEATHER_PUBLIC_URL:
+            return True
+        return settings.OPENWEATHER_API_KEY != "demo_key_for_testing"
+
+    async def fetch_location(self, key: str, location: Dict[str, Any]) -> WeatherData:
+        data = await self._get("weather", {"lat": location["lat"], "lon": location["lon"]})
+        return self._parse(key, location, data)
+
+    async def fetch_forecast(self, key: str, location: Dict[str, Any]) -> CityForecast:
+        """3-hourly, 5-day forecast"""
+        data = await self._get("forecast", {"lat": location["lat"], "lon": location["lon"]})
+        points = [
+            (item["dt"], item["main"]["temp"], item["main"]["humidity"], item["weather"][0]["description"].title())
+            for item in data.get("list", [])
+        ]
+        return CityForecast.from_points(key, self.source, time.time(), points)
+
+    def request_cost(self, cities: List[str]) -> int:
+        grouped = sum(1 for city in cities if settings.CITIES[city].get("owm_id"))
+        chunks = -(-grouped // settings.OPENWEATHER_GROUP_MAX_IDS)
+        return chunks + len(cities) - grouped
+
+    async def fetch_batch(self, cities: List[str]) -> Dict[str, WeatherData]:
+        """Fetch cities with owm ids through /group, chunked to the provider's id limit"""
+        # Cities without an OpenWeatherMap id can't join a group request
+        grouped = [city for city in cities if settings.CITIES[city].get("owm_id")]
+        single = [city for city in cities if not settings.CITIES[city].get("owm_id")]
+
+        chunks = list(chunked(grouped, settings.OPENWEATHER_GROUP_MAX_IDS))
+        results = await asyncio.gather(
+            *[self._fetch_group(chunk) for chunk in chunks],
+            *[self.fetch_current(city) for city in single],
+            return_exceptions=True
+        )
+
+        readings: Dict[str, WeatherData] = {}
+        for result in results[:len(chunks)]:
+            if isinstance(result, dict):
+                readings.update(result)
+        for city, result in zip(single, results[len(chunks):]):
+            if isinstance(result, WeatherData):
+                readings[city] = result
+
+        if not readings and cities:
+            raise ProviderError(f"OpenWeatherMap returned no readings for {len(cities)} cities")
+        logger.info(f"🌐 Batch fetched {len(readings)} cities in {len(chunks) + len(single)} upstream requests")
+        return readings
+
+    async def _fetch_group(self, cities: List[str]) -> Dict[str, WeatherData]:
+        """Fetch one chunk of cities with a single group-by-id request"""
+        ids = {str(settings.CITIES[city]["owm_id"]): city for city in cities}
+        data = await self._get("group", {"id": ",".join(ids)})
+
+        readings = {}
+        for item in data.get("list", []):
+            city = ids.get(str(item.get("id")))
+            if city is not None:
+                readings[city] = self._parse(city, settings.CITIES[city], item)
+        return readings
+
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = {
+            **params,
+            "appid": settings.OPENWEATHER_API_KEY,
+            "units": "metric",  # Celsius
+            "lang": "es"  # Spanish
+        }
+        session = await http_client.get_session()
+        async with session.get(f"{settings.OPENWEATHER_BASE_URL.rstrip('/')}/{endpoint}", params=params) as response:
+            if response.status != 200:
+                raise ProviderError(f"OpenWeatherMap API error: {response.status}")
+            return await response.json()
+
+    def _parse(self, key: str, location: Dict[str, Any], data: Dict[str, Any]) -> WeatherData:
+        """Build WeatherData from an OpenWeatherMap current weather payload"""
+        return self.build_weather_data(
+            key,
+            location,
+            temperature=data["main"]["temp"],
+            humidity=data["main"]["humidity"],
+            description=data["weather"][0]["description"].title()
+        )
@@ -0,0 +1,69 @@
+"""
+Registry of configured weather providers in priority order
+"""
+import logging
+from typing import Dict, List
+from app.core.settings import settings
+from app.services.circuit_breaker import circuit_breakers
+from app.services.providers.base import WeatherProvider
+from app.services.providers.open_meteo import OpenMeteoProvider
+from app.services.providers.openweathermap import OpenWeatherMapProvider
+from app.services.providers.synthetic import SyntheticProvider
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_CLASSES = {
+    OpenWeatherMapProvider.name: OpenWeatherMapProvider,
+    OpenMeteoProvider.name: OpenMeteoProvider,
+    SyntheticProvider.name: SyntheticProvider
+}
+
+class ProviderRegistry:
+    """Holds provider instances ordered by settings.WEATHER_PROVIDERS"""
+
+    def __init__(self):
+        self.providers: Dict[str, WeatherProvider] = {}
+        self.hedged_requests = 0
+        for name in settings.WEATHER_PROVIDERS:
+            if name not in PROVIDER_CLASSES:
+                logger.warning(f"⚠️ Unknown weather provider '{name}' ignored")
+                continue
+            self.register(PROVIDER_CLASSES[name]())
+
+    def register(self, provider: WeatherProvider):
+        """Add a provider at the lowest priority"""
+        self.providers[provider.name] = provider
+
+    def get(self, name: str) -> WeatherProvider:
+        """Get a provider by name"""
+        return self.providers[name]
+
+    def get_active(self) -> List[WeatherProvider]:
+        """Get available providers in priority order"""
+        return [provider for provider in self.providers.values() if provider.is_available()]
+
+    def get_quota_stats(self) -> Dict[str, dict]:
+        """Get remaining upstream budget per provider"""
+        return {name: provider.quota.get_stats() for name, provider in self.providers.items()}
+
+    def seconds_until_retry(self) -> float:
+        """Seconds until any active provider accepts calls again"""
+        delays = [circuit_breakers.get(provider.name).seconds_until_retry() for provider in self.get_active()]
+        return min(delays) if delays else 0.0
+
+    def get_stats(self) -> dict:
+        """Get hedging counters plus availability, wins and latency per provider"""
+        return {
+            "hedged_requests": self.hedged_requests,
+            "providers": {
+                name: {
+                    "available": provider.is_available(),
+                    "wins": provider.wins,
+                    "latency": provider.latency.get_stats()
+                }
+                for name, provider in self.providers.items()
+            }
+        }
+
+# Global provider registry instance
+provider_registry = ProviderRegistry()
@@ -0,0 +1,33 @@
+"""
+Synthetic weather provider backed by the seeded simulation engine
+"""
+from typing import Any, Dict, List
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+from app.models.weather import WeatherData
+from app.services.providers.base import WeatherProvider
+from app.services.simulation import synthetic_engine
+
+class SyntheticProvider(WeatherProvider):
+    """Reproducible generated readings for any number of cities, without network calls"""
+
+    name = "synthetic"
+    source = "Datos sintéticos"
+    real_data = False
+
+    async def fetch_location(self, key: str, location: Dict[str, Any]) -> WeatherData:
+        temperature, humidity, description = synthetic_engine.generate([key], locations={key: location})[key]
+        return self.build_weather_data(key, location, temperature, humidity, description)
+
+    async def fetch_forecast(self, key: str, location: Dict[str, Any]) -> CityForecast:
+        return synthetic_engine.forecast(key, location, self.source)
+
+    def request_cost(self, cities: List[str]) -> int:
+        return 0
+
+    async def fetch_batch(self, cities: List[str]) -> Dict[str, WeatherData]:
+        readings = synthetic_engine.generate(cities)
+        return {
+            city: self.build_weather_data(city, settings.CITIES[city], temperature, humidity, description)
+            for city, (temperature, humidity, description) in readings.items()
+        }
@@ -0,0 +1,107 @@
+"""
+Quota-aware scheduling of upstream provider calls
+"""
+import asyncio
+import logging
+import time
+from enum import Enum
+from app.core.settings import settings
+from app.utils.helpers import get_colombia_time
+
+logger = logging.getLogger(__name__)
+
+class QuotaPriority(Enum):
+    ROBOT = "robot"
+    ADHOC = "adhoc"
+
+class QuotaExceededError(Exception):
+    """Raised when an upstream call doesn't fit in the provider's budget"""
+
+class QuotaScheduler:
+    """Token bucket for a calls/minute budget plus a calls/day counter.
+
+    Robot refreshes may use the whole bucket and queue for refill; ad-hoc
+    fetches are refused once the bucket drops into the robot reserve.
+    A budget of 0 means unlimited.
+    """
+
+    def __init__(self, name: str, calls_per_minute: int, calls_per_day: int):
+        self.name = name
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day
+        self.tokens = float(calls_per_minute)
+        self.refilled_at = time.monotonic()
+        self.day = get_colombia_time().date()
+        self.calls_today = 0
+        self.queued = 0
+        self.rejected = 0
+        self._queue_lock = asyncio.Lock()
+
+    async def acquire(self, priority: QuotaPriority, cost: int = 1):
+        """Take `cost` calls from the budget, waiting (robots) or raising QuotaExceededError"""
+        self._roll_day()
+        if self.calls_per_day and self.calls_today + cost > self.calls_per_day:
+            self.rejected += 1
+            raise QuotaExceededError(f"{self.name} daily budget of {self.calls_per_day} calls exhausted")
+
+        if self.calls_per_minute:
+            if priority == QuotaPriority.ROBOT:
+                await self._wait_for_tokens(cost)
+            else:
+                self._refill()
+                reserve = self.calls_per_minute * settings.QUOTA_ROBOT_RESERVE
+                if self.tokens - cost < reserve:
+                    self.rejected += 1
+                    raise QuotaExceededError(f"{self.name} per-minute budget reserved for robot refreshes")
+            self.tokens -= cost
+
+        self.calls_today += cost
+
+    async def _wait_for_tokens(self, cost: int):
+        """Queue robot calls in arrival order until the bucket refills"""
+        # A batch larger than the bucket only waits for a full bucket and runs into debt
+        needed = min(cost, self.calls_per_minute)
+        self.queued += 1
+        try:
+            async with self._queue_lock:
+                deadline = time.monotonic() + settings.QUOTA_MAX_WAIT
+                while True:
+                    self._refill()
+                    if self.tokens >= needed:
+                        return
+                    wait = (needed - self.tokens) * 60 / self.calls_per_minute
+                    if time.monotonic() + wait > deadline:
+                        self.rejected += 1
+                        raise QuotaExceededError(f"{self.name} per-minute budget exhausted")
+                    await asyncio.sleep(wait)
+        finally:
+            self.queued -= 1
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.calls_per_minute),
+            self.tokens + (now - self.refilled_at) * self.calls_per_minute / 60
+        )
+        self.refilled_at = now
+
+    def _roll_day(self):
+        today = get_colombia_time().date()
+        if today != self.day:
+            self.day = today
+            self.calls_today = 0
+
+    def get_stats(self) -> dict:
+        """Get remaining budget and counters"""
+        self._roll_day()
+        if self.calls_per_minute:
+            self._refill()
+        return {
+            "minute_budget": self.calls_per_minute or None,
+            "minute_remaining": max(0, int(self.tokens)) if self.calls_per_minute else None,
+            "day_budget": self.calls_per_day or None,
+            "day_remaining": max(0, self.calls_per_day - self.calls_today) if self.calls_per_day else None,
+            "calls_today": self.calls_today,
+            "queued": self.queued,
+            "rejected": self.rejected
+        }
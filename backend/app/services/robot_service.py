@@ -3,67 +3,155 @@ Robot service for background weather data collection tasks
 """
 import asyncio
 import logging
-from typing import Dict
+import random
+from typing import Dict, List, Optional
 from app.services.weather_service import WeatherService
-from app.services.websocket_manager import websocket_manager
-from app.models.weather import WeatherUpdate
+from app.services.adaptive_polling import adaptive_polling
+from app.services.broker import broker, weather_channel
+from app.services.change_detector import BroadcastDecision, change_detector
+from app.models.weather import WeatherData, WeatherKeepalive, WeatherUpdate
 from app.core.settings import settings
+from app.utils.helpers import chunked
+from app.utils.timer_wheel import TimerWheel
 
 logger = logging.getLogger(__name__)
 
 class RobotService:
-    """Service for managing robot background tasks"""
+    """Service for managing robot background tasks.
+
+    A single timer wheel owns every city's next refresh; one scheduler task
+    turns it and hands due cities in batches to a fixed pool of workers, so
+    event-loop overhead doesn't grow with the number of cities.
+    """
     
     def __init__(self):
-        self.robot_tasks: Dict[str, asyncio.Task] = {}
+        self.intervals: Dict[str, float] = {}
+        self.wheel = TimerWheel(resolution=settings.ROBOT_TICK_RESOLUTION)
+        self.batches: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
     
     async def start_all_robots(self):
-        """Start all robot background tasks"""
+        """Start the robot scheduler and worker pool, staggering each city's first refresh"""
+        self.wheel = TimerWheel(resolution=settings.ROBOT_TICK_RESOLUTION)
+        self.batches = asyncio.Queue(maxsize=settings.ROBOT_WORKERS * 2)
         for city, interval in settings.ROBOT_INTERVALS.items():
-            self.robot_tasks[city] = asyncio.create_task(
-                self._robot_worker(city, interval)
-            )
-        logger.info(f"🚀 Robot background tasks started - {', '.join([f'{city.title()} ({interval}s)' for city, interval in settings.ROBOT_INTERVALS.items()])}")
+            self.intervals[city] = interval
+            self.wheel.schedule(city, random.uniform(0, min(interval, settings.ROBOT_STARTUP_SPREAD)))
+        
+        self.tasks = [asyncio.create_task(self._scheduler())]
+        self.tasks.extend(asyncio.create_task(self._robot_worker(worker)) for worker in range(settings.ROBOT_WORKERS))
+        logger.info(f"🚀 Robot scheduler started - {len(self.intervals)} cities, {settings.ROBOT_WORKERS} workers")
     
     async def stop_all_robots(self):
         """Stop all robot background tasks"""
-        for task in self.robot_tasks.values():
+        for task in self.tasks:
             task.cancel()
-        self.robot_tasks.clear()
+        self.tasks.clear()
+        self.intervals.clear()
+        adaptive_polling.clear()
+        self.wheel = TimerWheel(resolution=settings.ROBOT_TICK_RESOLUTION)
         logger.info("🛑 Robot background tasks stopped")
     
+    def add_robot(self, city: str, interval: float):
+        """Start (or retune) a city's robot while the scheduler is running"""
+        if not self.tasks:
+            return
+        is_new = city not in self.intervals
+        self.intervals[city] = interval
+        if is_new and city not in self.wheel:
+            self.wheel.schedule(city, random.uniform(0, min(interval, settings.ROBOT_STARTUP_SPREAD)))
+            logger.info(f"🤖 Robot {city} started ({interval}s)")
+    
+    def remove_robot(self, city: str):
+        """Stop a city's robot; an in-flight refresh finishes but isn't rescheduled"""
+        if self.intervals.pop(city, None) is not None:
+            self.wheel.cancel(city)
+            logger.info(f"🛑 Robot {city} stopped")
+    
     def get_running_robots(self) -> list:
         """Get list of running robot cities"""
-        return list(self.robot_tasks.keys())
+        return list(self.intervals.keys())
     
     def get_robot_count(self) -> int:
         """Get number of running robots"""
-        return len(self.robot_tasks)
+        return len(self.intervals)
+    
+    def get_intervals(self) -> Dict[str, float]:
+        """Get the current (adaptive) polling interval of each robot in seconds"""
+        return {city: round(interval, 1) for city, interval in self.intervals.items()}
     
-    async def _robot_worker(self, city: str, interval: int):
-        """Background task simulating robot sending weather data"""
+    async def _scheduler(self):
+        """Turn the timer wheel and queue due cities for the workers in batches"""
         while True:
             try:
-                weather = await WeatherService.get_weather_data(city)
+                await asyncio.sleep(settings.ROBOT_TICK_RESOLUTION)
+                due = self.wheel.advance()
+                for batch in chunked(due, settings.ROBOT_BATCH_SIZE):
+                    await self.batches.put(batch)
                 
-                message = WeatherUpdate(
-                    type="weather_update",
-                    robot=f"robot_{city}",
-                    data=weather,
-                    message=f"{weather.emoji} Robot {weather.name}: {weather.temperature}°C, {weather.description} - {weather.time} ({weather.source})"
-                )
-                
-                await websocket_manager.broadcast_to_observers(message.dict())
-                logger.info(f"🤖 Robot {city} sent data: {weather.temperature}°C")
+            except asyncio.CancelledError:
+                logger.info("🛑 Robot scheduler cancelled")
+                break
+            except Exception as e:
+                logger.error(f"❌ Error in robot scheduler: {e}")
+    
+    async def _robot_worker(self, worker: int):
+        """Background worker simulating robots sending weather data for a batch of due cities"""
+        while True:
+            try:
+                cities = await self.batches.get()
+            except asyncio.CancelledError:
+                break
+            
+            try:
+                readings = await WeatherService.refresh_weather_data_batch(cities)
                 
-                await asyncio.sleep(interval)
+                for city in cities:
+                    weather = readings.get(city)
+                    if weather is not None:
+                        if not weather.stale and city in self.intervals:
+                            self.intervals[city] = adaptive_polling.observe(
+                                city, weather, settings.ROBOT_INTERVALS.get(city, self.intervals[city])
+                            )
+                        await self._broadcast_weather(city, weather)
                 
             except asyncio.CancelledError:
-                logger.info(f"🛑 Robot {city} task cancelled")
+                logger.info(f"🛑 Robot worker {worker} cancelled")
                 break
             except Exception as e:
-                logger.error(f"❌ Error in robot {city}: {e}")
-                await asyncio.sleep(interval)
+                logger.error(f"❌ Error in robot worker {worker} ({len(cities)} cities): {e}")
+            finally:
+                self._reschedule(cities)
+    
+    def _reschedule(self, cities: List[str]):
+        """Schedule the next refresh of each city one jittered interval from now"""
+        for city in cities:
+            interval = self.intervals.get(city)
+            if interval is None:
+                continue
+            jitter = random.uniform(-settings.ROBOT_JITTER, settings.ROBOT_JITTER) * interval
+            self.wheel.schedule(city, interval + jitter)
+    
+    async def _broadcast_weather(self, city: str, weather: WeatherData):
+        """Publish a robot weather update for every worker's subscribed observers, unless it carries nothing new"""
+        decision = change_detector.decide(city, weather)
+        if decision == BroadcastDecision.SUPPRESS:
+            return
+        if decision == BroadcastDecision.KEEPALIVE:
+            keepalive = WeatherKeepalive(robot=f"robot_{city}", city=city, time=weather.time)
+            await broker.publish(weather_channel(city), keepalive.dict())
+            return
+        
+        message = WeatherUpdate(
+            type="weather_update",
+            robot=f"robot_{city}",
+            data=weather,
+            message=f"{weather.emoji} Robot {weather.name}: {weather.temperature}°C, {weather.description} - {weather.time} ({weather.source})"
+        )
+        
+        # Every worker fans this out to its own observers (see WebSocketManager.on_weather_message)
+        await broker.publish(weather_channel(city), message.dict())
+        logger.info(f"🤖 Robot {city} sent data: {weather.temperature}°C")
 
 # Global robot service instance
 robot_service = RobotService()
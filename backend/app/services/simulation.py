@@ -0,0 +1,156 @@
+"""
+Deterministic, vectorized synthetic weather generator for load testing
+"""
+import logging
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.settings import settings
+from app.models.forecast import CityForecast
+
+logger = logging.getLogger(__name__)
+
+# Reading for one city: (temperature °C, humidity %, description)
+SyntheticReading = Tuple[float, int, str]
+
+DESCRIPTIONS = np.array(["Cielo Despejado", "Parcialmente Nublado", "Nublado", "Lluvia Ligera"])
+CLOUD_THRESHOLDS = np.array([0.7, 0.85, 1.0])
+
+LAPSE_RATE = 0.0055  # °C per metre of altitude
+SEA_LEVEL_TEMP = 30.0  # °C at the equator
+LATITUDE_COOLING = 0.2  # °C per degree of latitude
+SYNTHETIC_CITY_PREFIX = "station_"  # keys of generated stations
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+def _hash_uniform(keys: np.ndarray, salt: int) -> np.ndarray:
+    """Map uint64 keys to uniform floats in [0, 1) with a splitmix64 finalizer"""
+    z = keys + np.uint64((salt * _GOLDEN) & _MASK_64)
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+class SyntheticWeatherEngine:
+    """Generates readings for N cities in one array computation.
+
+    Every value is a pure function of (seed, city key, simulated time), so a
+    run is reproducible regardless of batch composition or call order.
+    """
+
+    def __init__(self, seed: int, start: Optional[float] = None, step: float = 60):
+        self.seed = seed
+        self.step = step
+        self.start = start
+        self._started_at = time.monotonic()
+
+    def now(self) -> float:
+        """Simulated UTC epoch seconds (wall clock unless a fixed start is configured)"""
+        if self.start is None:
+            return time.time()
+        return self.start + (time.monotonic() - self._started_at)
+
+    def generate(
+        self,
+        cities: List[str],
+        at: Optional[float] = None,
+        locations: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, SyntheticReading]:
+        """Generate one reading per city at simulated time `at` (locations default to settings.CITIES)"""
+        if not cities:
+            return {}
+        at = self.now() if at is None else at
+        locations = settings.CITIES if locations is None else locations
+        count = len(cities)
+
+        keys = np.fromiter((zlib.crc32(city.encode()) for city in cities), dtype=np.uint64, count=count)
+        lat = np.fromiter((locations[city]["lat"] for city in cities), dtype=np.float64, count=count)
+        lon = np.fromiter((locations[city]["lon"] for city in cities), dtype=np.float64, count=count)
+        altitude = np.fromiter((locations[city].get("altitude") or 0 for city in cities), dtype=np.float64, count=count)
+
+        # Static per-city climate traits
+        climate_offset = (_hash_uniform(keys, self.seed) - 0.5) * 3
+        amplitude = 3 + 3 * _hash_uniform(keys, self.seed + 1)
+        wetness = _hash_uniform(keys, self.seed + 2)
+
+        # Time-varying noise, constant within a step and within an hourly weather system
+        step_bucket = int(at // self.step)
+        hour_bucket = int(at // 3600)
+        step_noise = _hash_uniform(keys, self.seed * 1_000_003 + step_bucket) - 0.5
+        system_noise = _hash_uniform(keys, self.seed * 2_000_003 + hour_bucket) - 0.5
+        cloud_noise = _hash_uniform(keys, self.seed * 3_000_017 + step_bucket) - 0.5
+
+        # Diurnal cycle peaking at 15:00 local solar time
+        local_hour = (at / 3600 + lon / 15) % 24
+        diurnal = amplitude * np.sin(2 * np.pi * (local_hour - 9) / 24)
+
+        mean_temp = SEA_LEVEL_TEMP - LATITUDE_COOLING * np.abs(lat) - LAPSE_RATE * altitude + climate_offset
+        temperature = mean_temp + diurnal + 2 * system_noise + 1.5 * step_noise
+
+        # Humidity runs opposite to the diurnal temperature swing
+        humidity = 60 + 20 * wetness - 3 * (temperature - mean_temp) + 10 * system_noise + 4 * step_noise
+        humidity = np.clip(np.rint(humidity), 15, 100).astype(np.int64)
+
+        cloudiness = humidity / 100 + 0.3 * cloud_noise
+        description = DESCRIPTIONS[np.searchsorted(CLOUD_THRESHOLDS, cloudiness)]
+
+        return {
+            city: (float(temp), int(hum), str(desc))
+            for city, temp, hum, desc in zip(cities, temperature.tolist(), humidity.tolist(), description.tolist())
+        }
+
+    def forecast(self, key: str, location: Dict[str, Any], source: str) -> CityForecast:
+        """Hourly forecast for the next settings.FORECAST_HOURS hours from the same model"""
+        now = self.now()
+        first_hour = (now // 3600 + 1) * 3600
+        points = []
+        for hour in range(settings.FORECAST_HOURS):
+            at = first_hour + hour * 3600
+            temperature, humidity, description = self.generate([key], at=at, locations={key: location})[key]
+            points.append((at, temperature, humidity, description))
+        return CityForecast.from_points(key, source, time.time(), points)
+
+def is_synthetic_city(city: str) -> bool:
+    """Check whether a city key belongs to a generated station"""
+    return city.startswith(SYNTHETIC_CITY_PREFIX)
+
+def generate_synthetic_cities(count: int, seed: int) -> Dict[str, Dict[str, Any]]:
+    """Generate `count` reproducible stations spread over Colombia"""
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-4.2, 12.5, count)
+    lon = rng.uniform(-79.0, -67.0, count)
+    altitude = np.clip(rng.gamma(1.5, 700, count), 0, 3800)
+    mean_temp = SEA_LEVEL_TEMP - LATITUDE_COOLING * np.abs(lat) - LAPSE_RATE * altitude
+
+    cities = {}
+    for index in range(count):
+        cities[f"{SYNTHETIC_CITY_PREFIX}{index:05d}"] = {
+            "lat": round(float(lat[index]), 4),
+            "lon": round(float(lon[index]), 4),
+            "name": f"Estación {index:05d}",
+            "emoji": "📡",
+            "altitude": int(altitude[index]),
+            "avg_temp_range": f"{round(mean_temp[index] - 4)}-{round(mean_temp[index] + 4)}°C"
+        }
+    return cities
+
+def register_synthetic_cities():
+    """Add settings.SIMULATION_CITY_COUNT generated stations to the configured cities and robots"""
+    if settings.SIMULATION_CITY_COUNT <= 0:
+        return
+    cities = generate_synthetic_cities(settings.SIMULATION_CITY_COUNT, settings.SIMULATION_SEED)
+    settings.CITIES.update(cities)
+    for city in cities:
+        settings.ROBOT_INTERVALS.setdefault(city, settings.SIMULATION_ROBOT_INTERVAL)
+    logger.info(f"📡 Registered {len(cities)} synthetic stations (seed {settings.SIMULATION_SEED})")
+
+# Global synthetic weather engine instance
+synthetic_engine = SyntheticWeatherEngine(
+    seed=settings.SIMULATION_SEED,
+    start=settings.SIMULATION_START,
+    step=settings.SIMULATION_STEP
+)
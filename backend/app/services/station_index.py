@@ -0,0 +1,155 @@
+"""
+Spatial index of monitored stations for nearest and within-radius lookups
+"""
+import heapq
+import logging
+import math
+from typing import Dict, List, Tuple
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+Cell = Tuple[int, int]
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class StationIndex:
+    """Uniform lat/lon grid over station coordinates.
+
+    Nearest-k searches expand rings of cells around the query until no
+    unvisited cell can hold a closer station; radius searches only visit
+    the cells overlapping the radius' bounding box.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.stations: Dict[str, Tuple[float, float]] = {}
+        self.cells: Dict[Cell, List[str]] = {}
+
+    def rebuild(self):
+        """Rebuild the index from the configured cities"""
+        self.stations.clear()
+        self.cells.clear()
+        for city, info in settings.CITIES.items():
+            self.register(city, info["lat"], info["lon"])
+        logger.info(f"🗺️ Station index built with {len(self.stations)} stations")
+
+    def register(self, key: str, lat: float, lon: float):
+        """Add or move a station"""
+        if key in self.stations:
+            self.remove(key)
+        self.stations[key] = (lat, lon)
+        self.cells.setdefault(self._cell(lat, lon), []).append(key)
+
+    def remove(self, key: str):
+        """Remove a station if indexed"""
+        coordinates = self.stations.pop(key, None)
+        if coordinates is None:
+            return
+        cell = self._cell(*coordinates)
+        members = self.cells.get(cell, [])
+        if key in members:
+            members.remove(key)
+        if not members:
+            self.cells.pop(cell, None)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[str, float]]:
+        """Get the k closest stations as (key, distance_km), closest first"""
+        if not self.stations or k <= 0:
+            return []
+        k = min(k, len(self.stations))
+        center_x, center_y = self._cell(lat, lon)
+        best: List[Tuple[float, str]] = []  # max-heap of (-distance, key)
+        cells_visited = 0
+        ring = 0
+
+        while True:
+            for cell in self._ring_cells(center_x, center_y, ring):
+                cells_visited += 1
+                for key in self.cells.get(cell, ()):
+                    distance = haversine_km(lat, lon, *self.stations[key])
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+
+            # Stations outside ring r are at least r cells away along one axis
+            if len(best) == k and -best[0][0] <= self._min_distance_outside(lat, ring):
+                break
+            # Sparse or far-away queries: scanning every station is cheaper than more empty rings
+            if cells_visited > len(self.stations):
+                return self._brute_force(lat, lon, k)
+            ring += 1
+
+        return [(key, distance) for distance, key in sorted((-d, key) for d, key in best)]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[str, float]]:
+        """Get all stations within radius_km as (key, distance_km), closest first"""
+        lat_span = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(89.0, abs(lat) + lat_span)))
+        lon_span = min(180.0, radius_km / (KM_PER_DEGREE * max(cos_lat, 1e-6)))
+
+        min_x, min_y = self._cell(lat - lat_span, lon - lon_span)
+        max_x, max_y = self._cell(lat + lat_span, lon + lon_span)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.cells):
+            candidates = self.stations.keys()
+        else:
+            candidates = [
+                key
+                for x in range(min_x, max_x + 1)
+                for y in range(min_y, max_y + 1)
+                for key in self.cells.get((x, y), ())
+            ]
+
+        matches = []
+        for key in candidates:
+            distance = haversine_km(lat, lon, *self.stations[key])
+            if distance <= radius_km:
+                matches.append((key, distance))
+        return sorted(matches, key=lambda match: match[1])
+
+    def _brute_force(self, lat: float, lon: float, k: int) -> List[Tuple[str, float]]:
+        distances = ((key, haversine_km(lat, lon, *coordinates)) for key, coordinates in self.stations.items())
+        return heapq.nsmallest(k, distances, key=lambda match: match[1])
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _ring_cells(self, center_x: int, center_y: int, ring: int):
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for dx in range(-ring, ring + 1):
+            yield center_x + dx, center_y - ring
+            yield center_x + dx, center_y + ring
+        for dy in range(-ring + 1, ring):
+            yield center_x - ring, center_y + dy
+            yield center_x + ring, center_y + dy
+
+    def _min_distance_outside(self, lat: float, ring: int) -> float:
+        """Lower bound on the distance to any station outside the searched rings"""
+        degrees = ring * self.cell_degrees
+        # Longitude degrees shrink towards the poles, so use the widest latitude reachable
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + degrees + self.cell_degrees)))
+        return degrees * KM_PER_DEGREE * min(1.0, cos_lat)
+
+    def get_stats(self) -> dict:
+        """Get index size"""
+        return {
+            "stations": len(self.stations),
+            "cells": len(self.cells),
+            "cell_degrees": self.cell_degrees
+        }
+
+# Global station index instance
+station_index = StationIndex(cell_degrees=settings.STATION_INDEX_CELL_DEGREES)
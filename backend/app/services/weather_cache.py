@@ -0,0 +1,177 @@
+"""
+Per-city TTL cache for weather data with single-flight request coalescing
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from app.core.settings import settings
+from app.models.weather import WeatherData
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[[str], Awaitable[Optional[WeatherData]]]
+
+class WeatherCache:
+    """Caches the latest reading per city and shares in-flight fetches"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[WeatherData, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._revalidations: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        # Bumped on every change so consumers can reuse work built from an unchanged cache
+        self.version = 0
+
+    def get(self, city: str) -> Optional[WeatherData]:
+        """Get the cached reading for a city if it is still fresh"""
+        entry = self._entries.get(city)
+        if entry is None:
+            return None
+        weather, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl:
+            return None
+        return weather
+
+    def get_last(self, city: str) -> Optional[WeatherData]:
+        """Get the last stored reading for a city regardless of its age"""
+        entry = self._entries.get(city)
+        return entry[0] if entry is not None else None
+
+    def set(self, city: str, weather: WeatherData):
+        """Store a reading for a city"""
+        self._entries[city] = (weather, time.monotonic())
+        self.version += 1
+
+    def seed(self, city: str, weather: WeatherData):
+        """Store a reading that is already expired: a fallback for the first fetch, never a cache hit"""
+        self._entries[city] = (weather, time.monotonic() - self.ttl - 1)
+        self.version += 1
+
+    def invalidate(self, city: str):
+        """Drop the cached reading for a city"""
+        if self._entries.pop(city, None) is not None:
+            self.version += 1
+
+    async def get_or_fetch(self, city: str, fetcher: Fetcher) -> Optional[WeatherData]:
+        """Return a fresh cached reading, or fetch it once for all concurrent callers"""
+        weather = self.get(city)
+        if weather is not None:
+            self.hits += 1
+            return weather
+        self.misses += 1
+        return await self.fetch(city, fetcher)
+
+    async def fetch(self, city: str, fetcher: Fetcher) -> Optional[WeatherData]:
+        """Fetch a new reading, joining an in-flight fetch for the same city if any"""
+        task = self._inflight.get(city)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(self._run_fetch(city, fetcher))
+            self._inflight[city] = task
+        # Shield so a cancelled caller doesn't cancel the fetch other callers share
+        return await asyncio.shield(task)
+
+    async def _run_fetch(self, city: str, fetcher: Fetcher) -> Optional[WeatherData]:
+        try:
+            weather = await fetcher(city)
+            # Stale fallbacks are served but never refresh the entry's age
+            if weather is not None and not weather.stale:
+                self.set(city, weather)
+            return weather
+        finally:
+            self._inflight.pop(city, None)
+
+    def schedule_revalidation(self, city: str, fetcher: Fetcher, retry_delay: Callable[[], float]):
+        """Refresh a stale city in the background until a fresh reading arrives"""
+        if city in self._revalidations:
+            return
+        self._revalidations[city] = asyncio.create_task(self._revalidate(city, fetcher, retry_delay))
+
+    async def _revalidate(self, city: str, fetcher: Fetcher, retry_delay: Callable[[], float]):
+        try:
+            while True:
+                await asyncio.sleep(max(1.0, retry_delay()))
+                weather = await self.fetch(city, fetcher)
+                if weather is None or not weather.stale:
+                    logger.info(f"♻️ Revalidated weather for {city}")
+                    return
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error revalidating weather for {city}: {e}")
+        finally:
+            self._revalidations.pop(city, None)
+
+    def cancel_background(self):
+        """Cancel pending background revalidations (called on shutdown)"""
+        for task in list(self._revalidations.values()):
+            task.cancel()
+
+    def get_stats(self) -> dict:
+        """Get cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "revalidating": len(self._revalidations),
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+class GeoWeatherCache(WeatherCache):
+    """Weather cache keyed by geohash bucket with LRU eviction under a memory cap"""
+
+    # Approximate per-entry overhead on top of the serialized reading (key, tuple, dict slot)
+    ENTRY_OVERHEAD_BYTES = 200
+
+    def __init__(self, ttl: float, max_bytes: int):
+        super().__init__(ttl)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[WeatherData, float]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[WeatherData]:
+        weather = super().get(key)
+        if weather is not None:
+            self._entries.move_to_end(key)
+        return weather
+
+    def set(self, key: str, weather: WeatherData):
+        self.invalidate(key)
+        super().set(key, weather)
+        size = len(weather.json()) + self.ENTRY_OVERHEAD_BYTES
+        self._sizes[key] = size
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self.invalidate(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        super().invalidate(key)
+        self.total_bytes -= self._sizes.pop(key, 0)
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats.update({
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions
+        })
+        return stats
+
+# Global weather cache instances
+weather_cache = WeatherCache(ttl=settings.WEATHER_CACHE_TTL)
+geo_weather_cache = GeoWeatherCache(ttl=settings.GEO_CACHE_TTL, max_bytes=settings.GEO_CACHE_MAX_BYTES)
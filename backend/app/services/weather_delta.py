@@ -0,0 +1,82 @@
+"""
+Versioned per-city weather deltas for observers that opt into delta mode
+"""
+from typing import Any, Dict, Optional
+from app.models.weather import WeatherData
+from app.services.weather_cache import weather_cache
+from app.utils.codec import Payload, SharedFrame
+
+class DeltaFrame:
+    """One city update, rendered lazily as a shared delta or baseline frame"""
+
+    __slots__ = ("city", "id", "version", "base", "data", "changes", "_baseline", "_delta")
+
+    def __init__(self, city: str, city_id: int, version: int, base: int, data: Dict[str, Any], changes: Dict[str, Any]):
+        self.city = city
+        self.id = city_id
+        self.version = version
+        self.base = base
+        self.data = data
+        self.changes = changes
+        self._baseline: Optional[SharedFrame] = None
+        self._delta: Optional[SharedFrame] = None
+
+    def render(self, versions: Dict[str, int], encoding: Optional[str] = None) -> Payload:
+        """Pick the delta if the client holds the base version, else the baseline, and record the new version"""
+        have = versions.get(self.city)
+        versions[self.city] = self.version
+        if have == self.base:
+            return self.delta.encode(encoding)
+        return self.baseline.encode(encoding)
+
+    @property
+    def baseline(self) -> SharedFrame:
+        if self._baseline is None:
+            self._baseline = SharedFrame(
+                {"type": "weather_baseline", "id": self.id, "city": self.city, "v": self.version, "data": self.data}
+            )
+        return self._baseline
+
+    @property
+    def delta(self) -> SharedFrame:
+        if self._delta is None:
+            self._delta = SharedFrame({"type": "weather_delta", "id": self.id, "v": self.version, "d": self.changes})
+        return self._delta
+
+class DeltaEncoder:
+    """Versions each city's readings and diffs new ones against the last broadcast"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.latest: Dict[str, DeltaFrame] = {}
+
+    def encode(self, city: str, weather: WeatherData) -> DeltaFrame:
+        """Version a new reading and compute the fields that changed since the last one"""
+        data = weather.dict()
+        previous = self.latest.get(city)
+        if previous is None:
+            base, changes = 0, data
+        else:
+            base = previous.version
+            changes = {field: value for field, value in data.items() if previous.data.get(field) != value}
+        city_id = self.ids.setdefault(city, len(self.ids) + 1)
+        frame = DeltaFrame(city, city_id, base + 1, base, data, changes)
+        self.latest[city] = frame
+        return frame
+
+    def baseline(self, city: str) -> Optional[DeltaFrame]:
+        """Get the latest versioned reading of a city, versioning the cached one if it was never broadcast"""
+        frame = self.latest.get(city)
+        if frame is None:
+            weather = weather_cache.get_last(city)
+            if weather is None:
+                return None
+            frame = self.encode(city, weather)
+        return frame
+
+    def forget(self, city: str):
+        """Drop a city's version chain (clients resync from a new baseline)"""
+        self.latest.pop(city, None)
+
+# Global delta encoder instance
+delta_encoder = DeltaEncoder()
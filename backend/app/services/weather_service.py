@@ -1,81 +1,244 @@
 """
 Weather data service for fetching real and simulated weather data
 """
-import aiohttp
-import random
+import asyncio
+import dataclasses
 import logging
-from typing import Optional
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
 from app.core.settings import settings
+from app.models.forecast import CityForecast
 from app.models.weather import WeatherData
+from app.services.weather_cache import weather_cache, geo_weather_cache
+from app.services.forecast_store import forecast_store
+from app.services.circuit_breaker import circuit_breakers
+from app.services.providers.base import ProviderError, WeatherProvider
+from app.services.providers.registry import provider_registry
+from app.services.quota_scheduler import QuotaExceededError, QuotaPriority
+from app.services.simulation import synthetic_engine
 from app.utils.helpers import get_colombia_time
+from app.utils import geohash
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+ProviderCall = Callable[[WeatherProvider], Awaitable[T]]
+
 class WeatherService:
     """Service for weather data operations"""
     
     @staticmethod
-    async def get_real_weather_data(city: str) -> Optional[WeatherData]:
-        """Get real weather data from OpenWeatherMap API"""
+    async def get_real_weather_data(city: str, priority: QuotaPriority = QuotaPriority.ADHOC) -> Optional[WeatherData]:
+        """Get real weather data from the configured providers (hedged across them)"""
         if city not in settings.CITIES:
             return None
         
-        city_info = settings.CITIES[city]
-        
-        # If no real API key, return simulated data
-        if settings.OPENWEATHER_API_KEY == "demo_key_for_testing":
-            logger.info(f"Using simulated data for {city} (no real API key configured)")
+        # If no provider is usable, return simulated data
+        providers = provider_registry.get_active()
+        if not providers:
+            logger.info(f"Using simulated data for {city} (no weather provider configured)")
             return await WeatherService.get_simulated_weather_data(city)
         
         try:
-            url = "https://api.openweathermap.org/data/2.5/weather"
-            params = {
-                "lat": city_info["lat"],
-                "lon": city_info["lon"],
-                "appid": settings.OPENWEATHER_API_KEY,
-                "units": "metric",  # Celsius
-                "lang": "es"  # Spanish
-            }
+            return await WeatherService._fetch_hedged(
+                providers, lambda provider: provider.fetch_current(city), priority
+            )
+        except ProviderError as e:
+            logger.error(f"Error fetching real weather data for {city}: {e}")
+            return await WeatherService.get_fallback_weather_data(city)
+
+    @staticmethod
+    async def get_real_weather_data_batch(cities: List[str], priority: QuotaPriority = QuotaPriority.ROBOT) -> Dict[str, WeatherData]:
+        """Get real weather data for many cities using each provider's bulk endpoint"""
+        cities = [city for city in dict.fromkeys(cities) if city in settings.CITIES]
+        if not cities:
+            return {}
+        
+        providers = provider_registry.get_active()
+        if not providers:
+            logger.info(f"Using simulated data for {len(cities)} cities (no weather provider configured)")
+            return {city: await WeatherService.get_simulated_weather_data(city) for city in cities}
+        
+        try:
+            readings = await WeatherService._fetch_hedged(
+                providers, lambda provider: provider.fetch_batch(cities), priority, cost=lambda provider: provider.request_cost(cities)
+            )
+        except ProviderError as e:
+            logger.error(f"Error fetching batch weather data for {len(cities)} cities: {e}")
+            readings = {}
+        
+        # Fill any city missing from the response with the fallback reading; robot batches retry on their own schedule
+        revalidate = priority != QuotaPriority.ROBOT
+        for city in cities:
+            if city not in readings:
+                readings[city] = await WeatherService.get_fallback_weather_data(city, revalidate)
+        return readings
+
+    @staticmethod
+    async def get_weather_at(lat: float, lon: float) -> WeatherData:
+        """Get weather for arbitrary coordinates, shared per geohash bucket"""
+        bucket = geohash.encode(lat, lon, settings.GEOHASH_PRECISION)
+        return await geo_weather_cache.get_or_fetch(bucket, WeatherService._fetch_geohash_bucket)
+
+    @staticmethod
+    async def _fetch_geohash_bucket(bucket: str) -> WeatherData:
+        """Fetch the reading at the centre of a geohash bucket"""
+        lat, lon = geohash.decode(bucket)
+        location = {
+            "lat": round(lat, 4),
+            "lon": round(lon, 4),
+            "name": f"{lat:.2f}, {lon:.2f}",
+            "emoji": "📍",
+            "altitude": None
+        }
+        
+        providers = provider_registry.get_active()
+        if providers:
+            try:
+                return await WeatherService._fetch_hedged(
+                    providers, lambda provider: provider.fetch_location(bucket, location), QuotaPriority.ADHOC
+                )
+            except ProviderError as e:
+                logger.error(f"Error fetching weather for geohash {bucket}: {e}")
+                last_good = geo_weather_cache.get_last(bucket)
+                if last_good is not None:
+                    return last_good.copy(update={"stale": True})
+        
+        temperature, humidity, description = synthetic_engine.generate([bucket], locations={bucket: location})[bucket]
+        return WeatherData(
+            city=bucket,
+            name=location["name"],
+            temperature=round(temperature),
+            humidity=humidity,
+            description=description,
+            time=get_colombia_time().strftime("%H:%M:%S"),
+            emoji=location["emoji"],
+            source="Datos simulados",
+            real_data=False
+        )
+
+    @staticmethod
+    async def get_forecast(city: str) -> Optional[CityForecast]:
+        """Get the hourly forecast for a city, refreshed upstream at most once per refresh window"""
+        if city not in settings.CITIES:
+            return None
+        return await forecast_store.get_or_fetch(city, WeatherService._fetch_forecast)
+
+    @staticmethod
+    async def _fetch_forecast(city: str) -> CityForecast:
+        """Fetch a forecast from the providers, falling back to the stored or simulated one"""
+        location = settings.CITIES[city]
+        providers = provider_registry.get_active()
+        if providers:
+            try:
+                return await WeatherService._fetch_hedged(
+                    providers, lambda provider: provider.fetch_forecast(city, location), QuotaPriority.ADHOC
+                )
+            except ProviderError as e:
+                logger.error(f"Error fetching forecast for {city}: {e}")
+                last = forecast_store.get_last(city)
+                # Simulated when nothing is stored; stale either way so the store retries upstream next time
+                return dataclasses.replace(last or synthetic_engine.forecast(city, location, "Datos simulados"), stale=True)
+        
+        return synthetic_engine.forecast(city, location, "Datos simulados")
+
+    @staticmethod
+    async def _fetch_hedged(
+        providers: List[WeatherProvider],
+        call: ProviderCall,
+        priority: QuotaPriority,
+        cost: Callable[[WeatherProvider], int] = lambda provider: 1
+    ) -> T:
+        """Call the primary provider and hedge to the next one if it is slower than its p95"""
+        primary = providers[0]
+        remaining = list(providers)
+        pending: Dict[asyncio.Task, WeatherProvider] = {}
+        errors: List[str] = []
+        
+        def launch():
+            provider = remaining.pop(0)
+            task = asyncio.create_task(WeatherService._call_provider(provider, call, priority, cost(provider)))
+            pending[task] = provider
+        
+        launch()
+        try:
+            while pending:
+                delay = WeatherService._hedge_delay(primary) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    # Primary is in its slow tail: fire the next provider and take whichever wins
+                    provider_registry.hedged_requests += 1
+                    launch()
+                    continue
+                
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        provider.wins += 1
+                        return task.result()
+                    errors.append(str(task.exception()))
+                
+                # Fail over immediately when everything in flight has failed
+                if not pending and remaining:
+                    launch()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        colombia_time = get_colombia_time()
-                        time = colombia_time.strftime("%H:%M:%S")
-                        
-                        return WeatherData(
-                            city=city,
-                            name=city_info["name"],
-                            temperature=round(data["main"]["temp"]),
-                            humidity=data["main"]["humidity"],
-                            description=data["weather"][0]["description"].title(),
-                            time=time,
-                            emoji=city_info["emoji"],
-                            source="OpenWeatherMap API",
-                            real_data=True,
-                            altitude=city_info["altitude"]
-                        )
-                    else:
-                        logger.error(f"OpenWeatherMap API error for {city}: {response.status}")
-                        return await WeatherService.get_simulated_weather_data(city)
-                        
+            raise ProviderError("; ".join(errors))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _call_provider(provider: WeatherProvider, call: ProviderCall, priority: QuotaPriority, cost: int) -> T:
+        """Call one provider through its circuit breaker and quota, recording its latency"""
+        breaker = circuit_breakers.get(provider.name)
+        if not breaker.allow_request():
+            raise ProviderError(f"{provider.name} circuit open")
+        
+        try:
+            # Robot refreshes may queue here for budget; ad-hoc calls fail fast to the cache
+            await provider.quota.acquire(priority, cost)
+            started = time.monotonic()
+            result = await call(provider)
+        except QuotaExceededError as e:
+            breaker.release_probe()
+            raise ProviderError(str(e)) from e
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
         except Exception as e:
-            logger.error(f"Error fetching real weather data for {city}: {e}")
-            return await WeatherService.get_simulated_weather_data(city)
+            breaker.record_failure()
+            raise ProviderError(f"{provider.name}: {e}") from e
+        
+        provider.latency.record(time.monotonic() - started)
+        breaker.record_success()
+        return result
+
+    @staticmethod
+    def _hedge_delay(provider: WeatherProvider) -> float:
+        """Hedge delay derived from the provider's recent latency percentile"""
+        if provider.latency.samples < settings.HEDGE_MIN_SAMPLES:
+            return settings.HEDGE_DEFAULT_DELAY
+        delay = provider.latency.percentile(settings.HEDGE_PERCENTILE)
+        return min(max(delay, settings.HEDGE_MIN_DELAY), settings.HEDGE_MAX_DELAY)
+
+    @staticmethod
+    async def get_fallback_weather_data(city: str, revalidate: bool = True) -> WeatherData:
+        """Get the last good reading (simulated if none) marked as stale, optionally revalidating it in the background"""
+        if revalidate:
+            weather_cache.schedule_revalidation(city, WeatherService.get_real_weather_data, provider_registry.seconds_until_retry)
+        
+        last_good = weather_cache.get_last(city)
+        if last_good is None:
+            # Cold start during an outage: stale so it is never cached as fresh and revalidation keeps going
+            last_good = await WeatherService.get_simulated_weather_data(city)
+        return last_good.copy(update={"stale": True})
 
     @staticmethod
     async def get_simulated_weather_data(city: str) -> WeatherData:
-        """Get simulated weather data for each city (fallback)"""
+        """Get simulated weather data for a city from the synthetic engine (fallback)"""
         city_info = settings.CITIES[city]
-        
-        if city == "bogota":
-            temp = random.randint(14, 22)
-            humidity = random.randint(60, 85)
-        else:  # medellin
-            temp = random.randint(20, 30)
-            humidity = random.randint(55, 75)
+        temperature, humidity, description = synthetic_engine.generate([city])[city]
         
         colombia_time = get_colombia_time()
         time = colombia_time.strftime("%H:%M:%S")
@@ -83,17 +246,33 @@ class WeatherService:
         return WeatherData(
             city=city,
             name=city_info["name"],
-            temperature=temp,
+            temperature=round(temperature),
             humidity=humidity,
-            description="Parcialmente nublado",
+            description=description,
             time=time,
             emoji=city_info["emoji"],
             source="Datos simulados",
             real_data=False,
-            altitude=city_info["altitude"]
+            altitude=city_info.get("altitude")
         )
 
     @staticmethod
     async def get_weather_data(city: str) -> WeatherData:
-        """Get weather data - tries real API first, falls back to simulated"""
-        return await WeatherService.get_real_weather_data(city)
+        """Get weather data - served from cache, tries real API first, falls back to simulated"""
+        return await weather_cache.get_or_fetch(city, WeatherService.get_real_weather_data)
+
+    @staticmethod
+    async def refresh_weather_data(city: str) -> WeatherData:
+        """Fetch a new reading bypassing the cache TTL and store it in the cache (robot priority)"""
+        return await weather_cache.fetch(
+            city, lambda city: WeatherService.get_real_weather_data(city, QuotaPriority.ROBOT)
+        )
+
+    @staticmethod
+    async def refresh_weather_data_batch(cities: List[str]) -> Dict[str, WeatherData]:
+        """Fetch new readings for many cities in batched requests and store them in the cache"""
+        readings = await WeatherService.get_real_weather_data_batch(cities, QuotaPriority.ROBOT)
+        for city, weather in readings.items():
+            if not weather.stale:
+                weather_cache.set(city, weather)
+        return readings
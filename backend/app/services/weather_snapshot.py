@@ -0,0 +1,146 @@
+"""
+Periodic on-disk snapshot of the latest reading per city for warm restarts
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from app.core.settings import settings
+from app.models.weather import WeatherData
+from app.services.weather_cache import weather_cache
+from app.services.leader_election import leader_election
+
+logger = logging.getLogger(__name__)
+
+# Per-city row layout; static fields (name, emoji, altitude) come from the registry on load
+SNAPSHOT_FIELDS = ("temperature", "humidity", "description", "time", "source", "real_data")
+SNAPSHOT_VERSION = 1
+
+class WeatherSnapshot:
+    """Writes the cached readings to a compact JSON file and restores them at startup.
+
+    Files are written to a temporary path and renamed into place, so a crash
+    mid-write leaves the previous snapshot intact. Restored readings are
+    stale and already expired, so they only serve as a fallback.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.restored = 0
+        self.saved_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> int:
+        """Seed the weather cache from the snapshot file (call before robots start)"""
+        try:
+            with open(self.path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable weather snapshot {self.path}: {e}")
+            return 0
+
+        try:
+            age = time.time() - snapshot.get("saved_at", 0)
+            if snapshot.get("version") != SNAPSHOT_VERSION or age > settings.WEATHER_SNAPSHOT_MAX_AGE:
+                logger.info(f"🗄️ Weather snapshot skipped (version {snapshot.get('version')}, {age:.0f}s old)")
+                return 0
+            fields = list(snapshot["fields"])
+            rows = snapshot["cities"].items()
+        except (AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring malformed weather snapshot {self.path}: {e}")
+            return 0
+
+        skipped = 0
+        for city, row in rows:
+            city_info = settings.CITIES.get(city)
+            if city_info is None or weather_cache.get_last(city) is not None:
+                continue
+            try:
+                values = dict(zip(fields, row))
+                weather = WeatherData(
+                    city=city,
+                    name=city_info["name"],
+                    emoji=city_info["emoji"],
+                    altitude=city_info.get("altitude"),
+                    stale=True,
+                    **{field: values[field] for field in SNAPSHOT_FIELDS}
+                )
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+            # Already expired, so the first read refetches but can still fall back to it
+            weather_cache.seed(city, weather)
+            self.restored += 1
+        if skipped:
+            logger.warning(f"⚠️ Skipped {skipped} malformed rows in weather snapshot {self.path}")
+        logger.info(f"🗄️ Restored {self.restored} readings from weather snapshot ({age:.0f}s old)")
+        return self.restored
+
+    def build(self) -> Dict[str, Any]:
+        """Collect the latest cached reading per city"""
+        cities = {}
+        for city in settings.CITIES:
+            weather = weather_cache.get_last(city)
+            if weather is not None:
+                cities[city] = [getattr(weather, field) for field in SNAPSHOT_FIELDS]
+        return {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "fields": SNAPSHOT_FIELDS, "cities": cities}
+
+    async def save(self):
+        """Write the snapshot atomically without blocking the event loop on disk I/O"""
+        snapshot = self.build()
+        payload = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))
+        await asyncio.to_thread(self._write, payload)
+        self.saved_at = snapshot["saved_at"]
+
+    def _write(self, payload: str):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+            snapshot_file.write(payload)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def start(self):
+        """Start saving snapshots every WEATHER_SNAPSHOT_INTERVAL seconds"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic task and write a final snapshot"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.interval > 0 and leader_election.is_leader:
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"❌ Error saving final weather snapshot: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                # Only the robot leader has the freshest readings; followers would overwrite them
+                if leader_election.is_leader:
+                    await self.save()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Error saving weather snapshot: {e}")
+
+    def get_stats(self) -> dict:
+        """Get snapshot file and timing info"""
+        return {
+            "path": self.path,
+            "restored": self.restored,
+            "last_saved_seconds_ago": round(time.time() - self.saved_at, 1) if self.saved_at else None
+        }
+
+# Global weather snapshot instance
+weather_snapshot = WeatherSnapshot(path=settings.WEATHER_SNAPSHOT_FILE, interval=settings.WEATHER_SNAPSHOT_INTERVAL)
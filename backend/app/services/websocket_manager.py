@@ -1,24 +1,181 @@
 """
 WebSocket management service for handling connections and broadcasting
 """
-import json
+import asyncio
+import fnmatch
 import logging
-from typing import List
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Union
 from fastapi import WebSocket
-from app.models.weather import WeatherUpdate, ConnectionMessage
+from app.models.weather import WeatherSnapshotMessage, WeatherUpdate, ConnectionMessage, SubscriptionAck
+from app.services.weather_cache import weather_cache
+from app.services.weather_delta import DeltaFrame, delta_encoder
+from app.services.station_index import station_index
+from app.core.settings import settings
+from app.utils.codec import JSON, Payload, SharedFrame, encode_batch, negotiate_encoding, send_payload
 
 logger = logging.getLogger(__name__)
 
+class OverflowPolicy:
+    DROP_OLDEST = "drop_oldest"
+    LATEST_PER_CITY = "latest_per_city"
+    DISCONNECT = "disconnect"
+
+# Topic every observer starts on until its first explicit subscribe
+ALL_CITIES = "*"
+
+# Distinct subscription sets whose connect snapshot is kept per cache version
+SNAPSHOT_CACHE_SIZE = 64
+
+# Queued frames are shared by every recipient and rendered per connection
+Frame = Union[SharedFrame, DeltaFrame]
+
+def is_pattern(topic: str) -> bool:
+    """Check whether a topic is a wildcard group (fnmatch syntax, e.g. "san_*")"""
+    return any(char in topic for char in "*?[")
+
+def topics_match(topics: Iterable[str], city: str) -> bool:
+    """Check whether any topic covers a city"""
+    return any(fnmatch.fnmatchcase(city, topic) if is_pattern(topic) else city == topic for topic in topics)
+
+class ObserverConnection:
+    """Bounded outbound queue for one observer, drained by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, max_queue: int, policy: str, flush_window: float = 0, encoding: Optional[str] = None):
+        self.websocket = websocket
+        self.encoding = encoding
+        self.max_queue = max_queue
+        self.policy = policy
+        self.flush_window = flush_window
+        self.queue: Deque[List] = deque()
+        self.pending: Dict[str, List] = {}
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.batched = 0
+        self.dropped = 0
+        self.drops_since_drain = 0
+        self.topics: Set[str] = set()
+        self.explicit = False
+        self.delta = False
+        self.versions: Dict[str, int] = {}
+        self.resyncs = 0
+
+    def matches(self, city: str) -> bool:
+        """Check whether any of this observer's topics covers a city"""
+        return topics_match(self.topics, city)
+
+    def enqueue(self, frame: Frame, key: Optional[str] = None) -> bool:
+        """Queue a frame without waiting; returns False when the observer should be evicted"""
+        if key is not None and self.policy == OverflowPolicy.LATEST_PER_CITY:
+            # Overwrite the queued frame for this city so a slow client skips readings instead of falling behind
+            entry = self.pending.get(key)
+            if entry is not None:
+                entry[1] = frame
+                return True
+
+        if len(self.queue) >= self.max_queue:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                return False
+            oldest = self.queue.popleft()
+            if oldest[0] is not None and self.pending.get(oldest[0]) is oldest:
+                del self.pending[oldest[0]]
+            self.dropped += 1
+            self.drops_since_drain += 1
+            if settings.OBSERVER_EVICT_AFTER_DROPS and self.drops_since_drain >= settings.OBSERVER_EVICT_AFTER_DROPS:
+                return False
+
+        entry = [key, frame]
+        self.queue.append(entry)
+        if key is not None and self.policy == OverflowPolicy.LATEST_PER_CITY:
+            self.pending[key] = entry
+        self.ready.set()
+        return True
+
+    async def drain(self):
+        """Write queued frames in order until cancelled or the socket fails"""
+        while True:
+            if not self.queue:
+                # Caught up: the consumer is keeping pace again
+                self.drops_since_drain = 0
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            if self.flush_window > 0 and self.queue[0][0] is not None:
+                # Let more city updates land so they go out as one frame
+                await asyncio.sleep(self.flush_window)
+            for payload in self._take_frames():
+                await send_payload(self.websocket, payload)
+                self.sent += 1
+
+    def _take_frames(self) -> List[Payload]:
+        """Empty the queue into outgoing frames, merging keyed frames when a flush window is set"""
+        if self.flush_window <= 0:
+            key, frame = entry = self.queue.popleft()
+            if key is not None and self.pending.get(key) is entry:
+                del self.pending[key]
+            return [self._render(frame)]
+
+        frames: List[Payload] = []
+        batch: Dict[str, Frame] = {}
+        while self.queue:
+            key, frame = self.queue.popleft()
+            if key is None:
+                frames.extend(self._batch_frame(batch))
+                batch = {}
+                frames.append(self._render(frame))
+            else:
+                # A newer frame for the same key replaces the older one
+                batch[key] = frame
+        frames.extend(self._batch_frame(batch))
+        self.pending.clear()
+        return frames
+
+    def _batch_frame(self, batch: Dict[str, Frame]) -> List[Payload]:
+        payloads = [self._render(frame) for frame in batch.values()]
+        if len(payloads) <= 1:
+            return payloads
+        self.batched += len(payloads)
+        # Entries are already encoded, so the batch is built by splicing them together
+        return [encode_batch(payloads, self.encoding or JSON)]
+
+    def _render(self, frame: Frame) -> Payload:
+        # Shared frames cache one payload per encoding; deltas render against this observer's versions
+        if isinstance(frame, SharedFrame):
+            return frame.encode(self.encoding)
+        if frame.city in self.versions and self.versions[frame.city] != frame.base:
+            self.resyncs += 1
+        return frame.render(self.versions, self.encoding)
+
 class WebSocketManager:
     """Manager for WebSocket connections and broadcasting"""
     
     def __init__(self):
-        self.observers: List[WebSocket] = []
+        self.observers: Dict[WebSocket, ObserverConnection] = {}
+        self.topics: Dict[str, Set[ObserverConnection]] = {}
+        self.patterns: Dict[str, Set[ObserverConnection]] = {}
+        self._snapshots: "OrderedDict[FrozenSet[str], Optional[SharedFrame]]" = OrderedDict()
+        self._snapshot_version = -1
+        self.snapshot_builds = 0
+        self.snapshot_hits = 0
+        self.evicted = 0
+        self.dropped_closed = 0
+        self.batched_closed = 0
+        self.resyncs_closed = 0
     
-    async def connect_observer(self, websocket: WebSocket):
-        """Connect a new observer"""
-        await websocket.accept()
-        self.observers.append(websocket)
+    async def connect_observer(self, websocket: WebSocket, topics: Optional[List[str]] = None, delta: bool = False):
+        """Connect a new observer, optionally subscribed to topics and/or in delta mode from the start"""
+        encoding = negotiate_encoding(websocket)
+        await websocket.accept(subprotocol=encoding)
+        connection = ObserverConnection(
+            websocket, settings.OBSERVER_QUEUE_SIZE, settings.OBSERVER_OVERFLOW_POLICY, settings.OBSERVER_FLUSH_WINDOW, encoding
+        )
+        connection.writer = asyncio.create_task(self._run_writer(connection))
+        self.observers[websocket] = connection
+        connection.delta = delta
+        connection.explicit = bool(topics)
+        for topic in (topics or [ALL_CITIES])[:settings.OBSERVER_MAX_TOPICS]:
+            self._add_topic(connection, topic)
         logger.info(f"✅ Observer connected. Total observers: {len(self.observers)}")
         
         # Send welcome message
@@ -27,38 +184,274 @@ class WebSocketManager:
             message="✅ Conectado como Observer - Recibirás datos automáticos de robots",
             timestamp=self._get_timestamp()
         )
-        await websocket.send_text(welcome.json())
+        self.send_to_observer(websocket, SharedFrame(welcome.dict()))
+        
+        # Send the latest known readings so the dashboard isn't empty until the next robot tick
+        if connection.delta:
+            self._send_baselines(connection, [city for city in settings.CITIES if connection.matches(city)])
+        else:
+            frame = self._cached_snapshot(connection.topics)
+            if frame is not None:
+                self.send_to_observer(websocket, frame)
     
     def disconnect_observer(self, websocket: WebSocket):
         """Disconnect an observer"""
-        if websocket in self.observers:
-            self.observers.remove(websocket)
+        connection = self.observers.pop(websocket, None)
+        if connection is None:
+            return
+        for topic in list(connection.topics):
+            self._remove_topic(connection, topic)
+        if connection.writer:
+            connection.writer.cancel()
+        self.dropped_closed += connection.dropped
+        self.batched_closed += connection.batched
+        self.resyncs_closed += connection.resyncs
         logger.info(f"🔌 Observer disconnected. Remaining: {len(self.observers)}")
     
-    async def broadcast_to_observers(self, message: dict):
-        """Send message to all connected observers"""
-        if not self.observers:
+    def send_to_observer(self, websocket: WebSocket, frame: SharedFrame, key: Optional[str] = None):
+        """Queue a frame for one observer"""
+        connection = self.observers.get(websocket)
+        if connection is not None and not connection.enqueue(frame, key):
+            self._evict(connection)
+    
+    async def broadcast_to_observers(self, message: dict, city: Optional[str] = None, key: Optional[str] = None):
+        """Queue a message for a city's subscribers (every observer without a city); key defaults to the city"""
+        recipients = self.observers.values() if city is None else self._subscribers(city)
+        if not recipients:
             return
         
-        disconnected = []
-        message_json = json.dumps(message)
+        frame = SharedFrame(message)
+        key = key or city
+        evict = [connection for connection in recipients if not connection.enqueue(frame, key)]
+        for connection in evict:
+            self._evict(connection)
+        logger.debug(f"📤 Queued broadcast for {len(recipients)} observers: {message.get('message', '')}")
+    
+    async def broadcast_weather(self, city: str, update: WeatherUpdate):
+        """Queue a robot weather update for a city's subscribers, as full JSON or a shared delta"""
+        # Version every update, even with no delta observers, so the chain stays continuous
+        delta_frame = delta_encoder.encode(city, update.data)
+        recipients = self._subscribers(city)
+        if not recipients:
+            return
         
-        for observer in self.observers:
-            try:
-                await observer.send_text(message_json)
-                logger.info(f"📤 Broadcasted to observer: {message.get('message', '')}")
-            except Exception as e:
-                logger.warning(f"Failed to send to observer: {e}")
-                disconnected.append(observer)
+        full_frame = SharedFrame(update.dict())
+        evict = []
+        for connection in recipients:
+            if not connection.enqueue(delta_frame if connection.delta else full_frame, city):
+                evict.append(connection)
+        for connection in evict:
+            self._evict(connection)
+        logger.debug(f"📤 Queued weather update for {len(recipients)} observers: {update.message}")
+    
+    async def on_weather_message(self, channel: str, message: dict):
+        """Broker handler: fan a published robot update out to this process's observers"""
+        city = channel.split(":", 1)[1]
+        if message.get("type") == "weather_keepalive":
+            await self.broadcast_to_observers(message, city=city, key=f"{city}:keepalive")
+            return
+        update = WeatherUpdate(**message)
+        # Workers that don't run the robots learn the latest reading here; stale fallbacks never refresh an entry
+        if not update.data.stale and weather_cache.get_last(city) != update.data:
+            weather_cache.set(city, update.data)
+        await self.broadcast_weather(city, update)
+    
+    def handle_control(self, websocket: WebSocket, message: dict) -> bool:
+        """Apply a subscribe/unsubscribe/resync control message; returns False for anything else (chat)"""
+        # {"type": "subscribe" | "unsubscribe", "cities": [...], "near": {"lat", "lon", "radius_km"}}
+        # or {"type": "resync", "cities": [...]} (every subscribed city when omitted)
+        kind = message.get("type")
+        if kind not in ("subscribe", "unsubscribe", "resync"):
+            return False
+        connection = self.observers.get(websocket)
+        if connection is None:
+            return True
         
-        # Clean up disconnected observers
-        for obs in disconnected:
-            self.disconnect_observer(obs)
+        try:
+            topics = self._parse_topics(message)
+            if kind == "resync":
+                self.resync(connection, topics)
+                return True
+            if kind == "subscribe":
+                self.subscribe(connection, topics)
+            else:
+                self.unsubscribe(connection, topics)
+        except ValueError as e:
+            error = ConnectionMessage(type="error", message=f"⚠️ {e}", timestamp=self._get_timestamp())
+            self.send_to_observer(websocket, SharedFrame(error.dict()))
+            return True
+        
+        ack = SubscriptionAck(
+            topics=sorted(connection.topics),
+            cities=sum(1 for city in settings.CITIES if connection.matches(city))
+        )
+        self.send_to_observer(websocket, SharedFrame(ack.dict()))
+        return True
+    
+    def subscribe(self, connection: ObserverConnection, topics: Iterable[str]):
+        """Add topics to an observer and send the latest reading of each newly covered city"""
+        if not connection.explicit:
+            # The first explicit subscribe replaces the implicit "everything"
+            connection.explicit = True
+            self._remove_topic(connection, ALL_CITIES)
+            covered = set()
+        else:
+            covered = {city for city in settings.CITIES if connection.matches(city)}
+        
+        new_topics = [topic for topic in topics if topic not in connection.topics]
+        if len(connection.topics) + len(new_topics) > settings.OBSERVER_MAX_TOPICS:
+            raise ValueError(f"Too many subscriptions (max {settings.OBSERVER_MAX_TOPICS})")
+        for topic in new_topics:
+            self._add_topic(connection, topic)
+        cities = [city for city in settings.CITIES if city not in covered and connection.matches(city)]
+        if connection.delta:
+            self._send_baselines(connection, cities)
+            return
+        frame = self._build_snapshot(cities)
+        if frame is not None:
+            self.send_to_observer(connection.websocket, frame)
+    
+    def unsubscribe(self, connection: ObserverConnection, topics: Iterable[str]):
+        """Remove topics from an observer"""
+        connection.explicit = True
+        for topic in topics:
+            self._remove_topic(connection, topic)
+    
+    def resync(self, connection: ObserverConnection, topics: List[str]):
+        """Resend baselines for the given cities (or every subscribed city) to a delta-mode observer"""
+        if not connection.delta:
+            return
+        cities = [city for city in settings.CITIES if connection.matches(city) and (not topics or topics_match(topics, city))]
+        connection.resyncs += self._send_baselines(connection, cities)
     
     def get_observer_count(self) -> int:
         """Get the number of connected observers"""
         return len(self.observers)
     
+    def get_stats(self) -> dict:
+        """Get outbound queue depth and overflow counters"""
+        connections = list(self.observers.values())
+        return {
+            "observers": len(connections),
+            "overflow_policy": settings.OBSERVER_OVERFLOW_POLICY,
+            "queue_limit": settings.OBSERVER_QUEUE_SIZE,
+            "queued": sum(len(connection.queue) for connection in connections),
+            "max_queue_depth": max((len(connection.queue) for connection in connections), default=0),
+            "flush_window_seconds": settings.OBSERVER_FLUSH_WINDOW,
+            "encodings": dict(Counter(connection.encoding or JSON for connection in connections)),
+            "delta_observers": sum(1 for connection in connections if connection.delta),
+            "delta_resyncs": self.resyncs_closed + sum(connection.resyncs for connection in connections),
+            "batched_updates": self.batched_closed + sum(connection.batched for connection in connections),
+            "dropped": self.dropped_closed + sum(connection.dropped for connection in connections),
+            "evicted": self.evicted,
+            "topics": len(self.topics),
+            "patterns": len(self.patterns),
+            "snapshot_builds": self.snapshot_builds,
+            "snapshot_hits": self.snapshot_hits
+        }
+    
+    def _subscribers(self, city: str) -> Set[ObserverConnection]:
+        subscribers = set(self.topics.get(city, ()))
+        for pattern, connections in self.patterns.items():
+            if fnmatch.fnmatchcase(city, pattern):
+                subscribers |= connections
+        return subscribers
+    
+    def _add_topic(self, connection: ObserverConnection, topic: str):
+        index = self.patterns if is_pattern(topic) else self.topics
+        index.setdefault(topic, set()).add(connection)
+        connection.topics.add(topic)
+    
+    def _remove_topic(self, connection: ObserverConnection, topic: str):
+        index = self.patterns if is_pattern(topic) else self.topics
+        subscribers = index.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del index[topic]
+        connection.topics.discard(topic)
+    
+    def _parse_topics(self, message: dict) -> List[str]:
+        cities = message.get("cities") or []
+        if isinstance(cities, str):
+            cities = [cities]
+        if not isinstance(cities, list) or not all(isinstance(city, str) and city.strip() for city in cities):
+            raise ValueError("'cities' must be a list of city keys or wildcard groups")
+        topics = [city.strip().lower() for city in cities]
+        
+        near = message.get("near")
+        if near is not None:
+            try:
+                stations = station_index.within(float(near["lat"]), float(near["lon"]), float(near["radius_km"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("'near' needs numeric lat, lon and radius_km")
+            topics.extend(city for city, _ in stations)
+        return list(dict.fromkeys(topics))
+    
+    def _cached_snapshot(self, topics: Set[str]) -> Optional[SharedFrame]:
+        """Get the connect snapshot for a subscription set, rebuilding only after the cache changed"""
+        if self._snapshot_version != weather_cache.version:
+            self._snapshots.clear()
+            self._snapshot_version = weather_cache.version
+        key = frozenset(topics)
+        if key in self._snapshots:
+            self._snapshots.move_to_end(key)
+            self.snapshot_hits += 1
+            return self._snapshots[key]
+        
+        frame = self._build_snapshot([city for city in settings.CITIES if topics_match(topics, city)])
+        self._snapshots[key] = frame
+        if len(self._snapshots) > SNAPSHOT_CACHE_SIZE:
+            self._snapshots.popitem(last=False)
+        return frame
+    
+    def _send_baselines(self, connection: ObserverConnection, cities: Iterable[str]) -> int:
+        """Queue the latest versioned reading of each city as a baseline for a delta-mode observer"""
+        queued = 0
+        for city in cities:
+            frame = delta_encoder.baseline(city)
+            if frame is not None:
+                # Forget what the client had so the frame renders as a full baseline
+                connection.versions.pop(city, None)
+                if not connection.enqueue(frame, city):
+                    self._evict(connection)
+                    break
+                queued += 1
+        return queued
+    
+    def _build_snapshot(self, cities: Iterable[str]) -> Optional[SharedFrame]:
+        """Serialize the latest cached reading of each city into one weather_snapshot frame"""
+        readings = [weather for weather in map(weather_cache.get_last, cities) if weather is not None]
+        if not readings:
+            return None
+        self.snapshot_builds += 1
+        return SharedFrame(WeatherSnapshotMessage(data=readings, timestamp=self._get_timestamp()).dict())
+    
+    async def _run_writer(self, connection: ObserverConnection):
+        try:
+            await connection.drain()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to send to observer: {e}")
+            self.disconnect_observer(connection.websocket)
+    
+    def _evict(self, connection: ObserverConnection):
+        """Drop a consumer that can't keep up and close its socket"""
+        if connection.websocket not in self.observers:
+            return
+        self.evicted += 1
+        logger.warning(f"🐢 Evicting slow observer ({len(connection.queue)} queued, {connection.dropped} dropped)")
+        self.disconnect_observer(connection.websocket)
+        asyncio.create_task(self._close(connection.websocket))
+    
+    async def _close(self, websocket: WebSocket):
+        try:
+            # 1013 = try again later
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+    
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
         from app.utils.helpers import get_colombia_time
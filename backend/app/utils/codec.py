@@ -0,0 +1,140 @@
+"""
+Wire encodings for WebSocket traffic: JSON text by default, MessagePack and/or deflate when negotiated
+"""
+import json
+import struct
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+from fastapi import WebSocket, WebSocketDisconnect
+
+try:
+    import msgpack
+except ImportError:  # Binary subprotocols are simply not offered
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "weather.msgpack"
+# Server-to-client frames are raw deflate (RFC 1951) of the base encoding; clients send uncompressed
+JSON_DEFLATE = "weather.json+deflate"
+MSGPACK_DEFLATE = "weather.msgpack+deflate"
+
+DEFLATE_SUFFIX = "+deflate"
+DEFLATE_LEVEL = 6
+# Empty final block that terminates a run of sync-flushed deflate pieces
+DEFLATE_FINAL_BLOCK = b"\x03\x00"
+
+Payload = Union[str, bytes]
+
+def supported_encodings() -> List[str]:
+    """Subprotocols this server can speak"""
+    if msgpack is None:
+        return [JSON_DEFLATE]
+    return [MSGPACK, MSGPACK_DEFLATE, JSON_DEFLATE]
+
+def negotiate_encoding(websocket: WebSocket) -> Optional[str]:
+    """Pick the client's most preferred supported subprotocol from its offer (None = plain JSON)"""
+    supported = supported_encodings()
+    for offered in websocket.scope.get("subprotocols", []):
+        if offered in supported:
+            return offered
+    return None
+
+def is_deflate(encoding: Optional[str]) -> bool:
+    return bool(encoding) and encoding.endswith(DEFLATE_SUFFIX)
+
+def deflate_piece(data: bytes) -> bytes:
+    """Compress into a sync-flushed piece with no final block, so pieces can be concatenated into frames"""
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+def encode(message: Any, encoding: Optional[str]) -> Payload:
+    """Serialize a message for one encoding"""
+    if is_deflate(encoding):
+        base = encode(message, encoding[:-len(DEFLATE_SUFFIX)])
+        if isinstance(base, str):
+            base = base.encode("utf-8")
+        return deflate_piece(base) + DEFLATE_FINAL_BLOCK
+    if encoding == MSGPACK:
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+def decode(payload: Payload) -> Any:
+    """Parse a binary MessagePack payload or a JSON text payload"""
+    if isinstance(payload, bytes):
+        if msgpack is None:
+            raise ValueError("Binary frames need the msgpack subprotocol")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+# weather_batch framing around already-encoded items
+JSON_BATCH_PREFIX = '{"type":"weather_batch","updates":['
+JSON_BATCH_SUFFIX = "]}"
+_DEFLATED_JSON_BATCH = {
+    part: deflate_piece(part.encode("utf-8")) for part in (JSON_BATCH_PREFIX, ",", JSON_BATCH_SUFFIX)
+}
+
+def _msgpack_batch_header(count: int) -> bytes:
+    if count < 16:
+        array_header = bytes([0x90 | count])
+    elif count < 0x10000:
+        array_header = b"\xdc" + struct.pack(">H", count)
+    else:
+        array_header = b"\xdd" + struct.pack(">I", count)
+    # fixmap(2) {"type": "weather_batch", "updates": [...]} with the array items spliced in after it
+    return b"\x82" + msgpack.packb("type") + msgpack.packb("weather_batch") + msgpack.packb("updates") + array_header
+
+@lru_cache(maxsize=256)
+def _deflated_msgpack_batch_header(count: int) -> bytes:
+    return deflate_piece(_msgpack_batch_header(count))
+
+def encode_batch(items: List[Payload], encoding: Optional[str]) -> Payload:
+    """Wrap already-encoded weather frames in a weather_batch frame without re-encoding (or recompressing) them"""
+    if is_deflate(encoding):
+        pieces = [item[:-len(DEFLATE_FINAL_BLOCK)] for item in items]
+        if encoding == MSGPACK_DEFLATE:
+            parts = [_deflated_msgpack_batch_header(len(items))] + pieces
+        else:
+            separator = _DEFLATED_JSON_BATCH[","]
+            parts = [_DEFLATED_JSON_BATCH[JSON_BATCH_PREFIX]]
+            for index, piece in enumerate(pieces):
+                if index:
+                    parts.append(separator)
+                parts.append(piece)
+            parts.append(_DEFLATED_JSON_BATCH[JSON_BATCH_SUFFIX])
+        return b"".join(parts) + DEFLATE_FINAL_BLOCK
+    if encoding == MSGPACK:
+        return _msgpack_batch_header(len(items)) + b"".join(items)
+    return JSON_BATCH_PREFIX + ",".join(items) + JSON_BATCH_SUFFIX
+
+async def send_payload(websocket: WebSocket, payload: Payload):
+    """Send a text or binary frame depending on the payload type"""
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+async def receive_payload(websocket: WebSocket) -> Payload:
+    """Receive the next text or binary frame"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return message["text"]
+
+class SharedFrame:
+    """A message shared by many recipients, encoded (and compressed) at most once per encoding"""
+
+    __slots__ = ("message", "_encoded")
+
+    def __init__(self, message: Any):
+        self.message = message
+        self._encoded: Dict[str, Payload] = {}
+
+    def encode(self, encoding: Optional[str]) -> Payload:
+        encoding = encoding or JSON
+        payload = self._encoded.get(encoding)
+        if payload is None:
+            payload = self._encoded[encoding] = encode(self.message, encoding)
+        return payload
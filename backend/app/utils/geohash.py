@@ -0,0 +1,59 @@
+"""
+Geohash encoding for bucketing coordinates
+"""
+from typing import Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+BASE32_INDEX = {char: index for index, char in enumerate(BASE32)}
+
+def encode(lat: float, lon: float, precision: int = 5) -> str:
+    """Encode coordinates as a geohash of `precision` characters"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        value, value_range = (lon, lon_range) if even else (lat, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits <<= 1
+            value_range[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Decode a geohash into its (min_lat, min_lon, max_lat, max_lon) cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            middle = (value_range[0] + value_range[1]) / 2
+            if (value >> shift) & 1:
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+            even = not even
+
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """Decode a geohash into the (lat, lon) centre of its cell"""
+    min_lat, min_lon, max_lat, max_lon = decode_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
@@ -2,12 +2,18 @@
 Utility functions for date/time and general helpers
 """
 from datetime import datetime, timezone, timedelta
+from typing import Iterator, List, Sequence
 
 def get_colombia_time() -> datetime:
     """Get current time in Colombia timezone (UTC-5)"""
     colombia_tz = timezone(timedelta(hours=-5))
     return datetime.now(colombia_tz)
 
+def chunked(items: Sequence, size: int) -> Iterator[List]:
+    """Split a sequence into consecutive lists of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
 def get_humidity_description(humidity: int) -> str:
     """Describe el nivel de humedad en términos comprensibles"""
     if humidity < 30:
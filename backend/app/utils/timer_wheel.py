@@ -0,0 +1,95 @@
+"""
+Hierarchical timer wheel for scheduling many recurring timers on one clock
+"""
+import math
+import time
+from typing import Dict, List, Set, Tuple
+
+class TimerWheel:
+    """Hashed hierarchical timer wheel keyed by string ids.
+
+    Level 0 has one slot per tick; each higher level covers `slots` times the
+    span of the one below it. Timers start in the coarsest level that fits and
+    cascade down as the wheel turns, so scheduling, cancelling and advancing
+    cost O(1) per timer regardless of how many are pending.
+    """
+
+    def __init__(self, resolution: float, slots: int = 64, levels: int = 4):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.current_tick = 0
+        self.origin = time.monotonic()
+        self.wheels: List[List[Set[str]]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self.deadlines: Dict[str, int] = {}
+        self.positions: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.deadlines
+
+    def schedule(self, key: str, delay: float):
+        """(Re)schedule `key` to fire `delay` seconds after the wheel's current time"""
+        self.cancel(key)
+        tick = self.current_tick + max(1, math.ceil(delay / self.resolution))
+        self.deadlines[key] = tick
+        self._place(key, tick)
+
+    def cancel(self, key: str):
+        """Drop a pending timer if present"""
+        if self.deadlines.pop(key, None) is None:
+            return
+        level, slot = self.positions.pop(key)
+        self.wheels[level][slot].discard(key)
+
+    def seconds_until(self, key: str) -> float:
+        """Seconds until a pending timer fires"""
+        return max(0.0, (self.deadlines[key] - self.current_tick) * self.resolution)
+
+    def advance(self, now: float = None) -> List[str]:
+        """Turn the wheel up to monotonic time `now` and return the keys that fired"""
+        now = time.monotonic() if now is None else now
+        target = int((now - self.origin) / self.resolution)
+        due: List[str] = []
+        while self.current_tick < target:
+            self.current_tick += 1
+            # Cascade coarse levels first so their timers can land in this tick's slot
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.current_tick % span == 0:
+                    self._cascade(level, (self.current_tick // span) % self.slots)
+            bucket = self.wheels[0][self.current_tick % self.slots]
+            if bucket:
+                self.wheels[0][self.current_tick % self.slots] = set()
+                for key in bucket:
+                    del self.positions[key]
+                    if self.deadlines[key] <= self.current_tick:
+                        del self.deadlines[key]
+                        due.append(key)
+                    else:
+                        self._place(key, self.deadlines[key])
+        return due
+
+    def _cascade(self, level: int, slot: int):
+        bucket = self.wheels[level][slot]
+        if not bucket:
+            return
+        self.wheels[level][slot] = set()
+        for key in bucket:
+            del self.positions[key]
+            self._place(key, self.deadlines[key])
+
+    def _place(self, key: str, tick: int):
+        delta = max(0, tick - self.current_tick)
+        for level in range(self.levels):
+            if delta < self.slots ** (level + 1):
+                break
+        else:
+            # Beyond the top level's span: park in its farthest slot and re-place on cascade
+            level = self.levels - 1
+            tick = self.current_tick + self.slots ** self.levels - 1
+        slot = (tick // self.slots ** level) % self.slots
+        self.wheels[level][slot].add(key)
+        self.positions[key] = (level, slot)
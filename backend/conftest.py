@@ -0,0 +1,6 @@
+"""
+Pytest setup for the backend tests (run from this directory)
+"""
+
+# Manual script that connects to a running server when imported, not a test module
+collect_ignore = ["test_client.py"]
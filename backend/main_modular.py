@@ -11,6 +11,15 @@ from app.core.settings import settings
 from app.api.routes import router as api_router
 from app.api.websockets import router as websocket_router
 from app.services.robot_service import robot_service
+from app.services.leader_election import leader_election
+from app.services.http_client import http_client
+from app.services.weather_cache import weather_cache
+from app.services.simulation import register_synthetic_cities
+from app.services.station_index import station_index
+from app.services.city_registry import city_registry
+from app.services.weather_snapshot import weather_snapshot
+from app.services.broker import broker
+from app.services.websocket_manager import websocket_manager
 
 # Configure logging  
 logging.basicConfig(
@@ -24,13 +33,28 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     logger.info(f"🚀 Starting {settings.APP_NAME} v{settings.VERSION}...")
-    await robot_service.start_all_robots()
+    city_registry.load()
+    register_synthetic_cities()
+    station_index.rebuild()
+    weather_snapshot.load()
+    await http_client.start()
+    city_registry.start_watching()
+    weather_snapshot.start()
+    broker.subscribe("weather:*", websocket_manager.on_weather_message)
+    await broker.start()
+    await leader_election.start(robot_service.start_all_robots)
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down application...")
+    city_registry.stop_watching()
     await robot_service.stop_all_robots()
+    await weather_snapshot.stop()
+    await leader_election.stop()
+    await broker.stop()
+    weather_cache.cancel_background()
+    await http_client.close()
 
 def create_app() -> FastAPI:
     """Application factory"""
@@ -66,5 +90,6 @@ if __name__ == "__main__":
         host=settings.HOST, 
         port=settings.PORT, 
         log_level="info",
+        ws_per_message_deflate=settings.WEBSOCKET_PER_MESSAGE_DEFLATE,
         reload=True
     )
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Local OpenWeatherMap-compatible stub server for offline benchmarks.
+
+Serves /data/2.5/weather, /data/2.5/group and /data/2.5/forecast with
+configurable latency, error and timeout injection, and can record real
+upstream responses to disk and replay them later.
+
+Point the app at it with:
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8001/data/2.5 python main.py
+
+Examples:
+    python owm_stub_server.py --latency lognormal --latency-ms 80 --error-rate 0.02
+    python owm_stub_server.py --mode record --api-key $OPENWEATHER_API_KEY
+    python owm_stub_server.py --mode replay --record-dir recordings
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Reuse the app's synthetic model so stub readings look like real ones
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from app.core.settings import settings
+from app.services.simulation import SyntheticWeatherEngine
+
+REAL_BASE_URL = "https://api.openweathermap.org/data/2.5"
+ENDPOINTS = ("weather", "group", "forecast")
+
+class StubConfig:
+    """Runtime options for the stub server"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.mode = args.mode
+        self.latency = args.latency
+        self.latency_ms = args.latency_ms
+        self.latency_jitter_ms = args.latency_jitter_ms
+        self.error_rate = args.error_rate
+        self.timeout_rate = args.timeout_rate
+        self.timeout_seconds = args.timeout_seconds
+        self.record_dir = Path(args.record_dir)
+        self.upstream = args.upstream.rstrip("/")
+        self.api_key = args.api_key
+        self.rng = random.Random(args.seed)
+        self.engine = SyntheticWeatherEngine(seed=args.seed)
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "recorded": 0, "replayed": 0, "replay_misses": 0}
+
+    def sample_latency(self) -> float:
+        """Sample a response delay in seconds from the configured distribution"""
+        if self.latency == "fixed":
+            delay = self.latency_ms
+        elif self.latency == "uniform":
+            delay = self.rng.uniform(self.latency_ms - self.latency_jitter_ms, self.latency_ms + self.latency_jitter_ms)
+        elif self.latency == "exponential":
+            delay = self.rng.expovariate(1 / self.latency_ms) if self.latency_ms > 0 else 0
+        else:  # lognormal: latency_ms is the median, jitter sets the tail
+            sigma = self.latency_jitter_ms / self.latency_ms if self.latency_ms > 0 else 0
+            delay = self.latency_ms * math.exp(self.rng.gauss(0, sigma))
+        return max(0.0, delay) / 1000
+
+def create_app(config: StubConfig) -> FastAPI:
+    """Build the stub FastAPI application"""
+    app = FastAPI(title="OpenWeatherMap Stub")
+    coordinates_by_id = {
+        str(info["owm_id"]): (info["lat"], info["lon"])
+        for info in settings.CITIES.values() if info.get("owm_id")
+    }
+
+    @app.get("/data/2.5/{endpoint}")
+    async def owm_endpoint(endpoint: str, request: Request):
+        config.stats["requests"] += 1
+        params = dict(request.query_params)
+        if endpoint not in ENDPOINTS:
+            return JSONResponse({"cod": "404", "message": "Internal error"}, status_code=404)
+
+        await asyncio.sleep(config.sample_latency())
+        roll = config.rng.random()
+        if roll < config.timeout_rate:
+            config.stats["timeouts"] += 1
+            await asyncio.sleep(config.timeout_seconds)
+            return JSONResponse({"cod": 504, "message": "stub timeout"}, status_code=504)
+        if roll < config.timeout_rate + config.error_rate:
+            config.stats["errors"] += 1
+            status = config.rng.choice([429, 500, 502, 503])
+            return JSONResponse({"cod": status, "message": "stub injected error"}, status_code=status)
+
+        if config.mode == "record":
+            status, body = await record(config, endpoint, params)
+        elif config.mode == "replay":
+            status, body = replay(config, endpoint, params)
+        else:
+            status, body = 200, generate(config, endpoint, params, coordinates_by_id)
+        return JSONResponse(body, status_code=status)
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        """Counters for the current stub run"""
+        return {"mode": config.mode, **config.stats}
+
+    return app
+
+def recording_path(config: StubConfig, endpoint: str, params: Dict[str, str]) -> Path:
+    """File that stores the response for an endpoint and its parameters (API key excluded)"""
+    key_params = sorted((name, value) for name, value in params.items() if name != "appid")
+    digest = hashlib.sha1(json.dumps(key_params).encode()).hexdigest()[:16]
+    return config.record_dir / f"{endpoint}_{digest}.json"
+
+async def record(config: StubConfig, endpoint: str, params: Dict[str, str]) -> Tuple[int, Any]:
+    """Proxy to the real API and write the response to disk"""
+    upstream_params = {**params, "appid": config.api_key or params.get("appid", "")}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{config.upstream}/{endpoint}", params=upstream_params) as response:
+            status = response.status
+            body = await response.json(content_type=None)
+
+    path = recording_path(config, endpoint, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"endpoint": endpoint, "params": params | {"appid": "***"}, "status": status, "body": body}))
+    config.stats["recorded"] += 1
+    return status, body
+
+def replay(config: StubConfig, endpoint: str, params: Dict[str, str]) -> Tuple[int, Any]:
+    """Serve a previously recorded response"""
+    path = recording_path(config, endpoint, params)
+    if not path.exists():
+        config.stats["replay_misses"] += 1
+        return 404, {"cod": "404", "message": "no recording for this request"}
+    recording = json.loads(path.read_text())
+    config.stats["replayed"] += 1
+    return recording["status"], recording["body"]
+
+def generate(config: StubConfig, endpoint: str, params: Dict[str, str], coordinates_by_id: Dict[str, Tuple[float, float]]) -> Any:
+    """Build an OpenWeatherMap-shaped payload from the synthetic model"""
+    if endpoint == "group":
+        items = []
+        for city_id in params.get("id", "").split(","):
+            if not city_id:
+                continue
+            lat, lon = coordinates_by_id.get(city_id) or pseudo_coordinates(city_id)
+            items.append(current_item(config, int(city_id) if city_id.isdigit() else 0, lat, lon))
+        return {"cnt": len(items), "list": items}
+
+    lat = float(params.get("lat", 0))
+    lon = float(params.get("lon", 0))
+    if endpoint == "forecast":
+        now = time.time()
+        first = (now // 10800 + 1) * 10800
+        items = [current_item(config, 0, lat, lon, at=first + step * 10800) for step in range(40)]
+        return {"cod": "200", "cnt": len(items), "list": items}
+    return current_item(config, 0, lat, lon)
+
+def current_item(config: StubConfig, city_id: int, lat: float, lon: float, at: Optional[float] = None) -> Dict[str, Any]:
+    """One current-weather item as returned by /weather and inside /group"""
+    key = f"{lat:.4f},{lon:.4f}"
+    location = {"lat": lat, "lon": lon}
+    temperature, humidity, description = config.engine.generate([key], at=at, locations={key: location})[key]
+    return {
+        "id": city_id,
+        "dt": int(at or time.time()),
+        "coord": {"lat": lat, "lon": lon},
+        "main": {"temp": round(temperature, 2), "humidity": humidity},
+        "weather": [{"description": description.lower()}],
+        "name": key
+    }
+
+def pseudo_coordinates(city_id: str) -> Tuple[float, float]:
+    """Stable coordinates for ids the stub doesn't know"""
+    value = zlib.crc32(city_id.encode())
+    return (value % 1670) / 100 - 4.2, ((value // 1670) % 1200) / 100 - 79.0
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenWeatherMap-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--mode", choices=["stub", "record", "replay"], default="stub")
+    parser.add_argument("--latency", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean (median for lognormal) latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=20, help="Uniform half-width or lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429/5xx")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of requests that hang")
+    parser.add_argument("--timeout-seconds", type=float, default=30, help="How long a hanging request stalls")
+    parser.add_argument("--record-dir", default="recordings")
+    parser.add_argument("--upstream", default=REAL_BASE_URL, help="Real API base URL used in record mode")
+    parser.add_argument("--api-key", default=settings.OPENWEATHER_API_KEY, help="Real API key used in record mode")
+    parser.add_argument("--seed", type=int, default=settings.SIMULATION_SEED)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = StubConfig(args)
+    print(f"🧪 Starting OpenWeatherMap stub ({args.mode}) on http://{args.host}:{args.port}/data/2.5")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
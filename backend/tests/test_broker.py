@@ -0,0 +1,137 @@
+"""
+Cross-process fanout through the Unix-socket broker
+"""
+import asyncio
+import os
+import tempfile
+from app.services.broker.server import BrokerServer
+from app.services.broker.unix_socket import UnixSocketBroker
+
+async def _wait_until(condition, timeout: float = 5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Timed out waiting for the broker")
+        await asyncio.sleep(0.01)
+
+def test_publish_on_one_broker_is_received_by_another():
+    async def scenario(path: str):
+        server_task = asyncio.create_task(BrokerServer(path, max_buffer=1024 * 1024).serve())
+        await _wait_until(lambda: os.path.exists(path))
+
+        publisher = UnixSocketBroker(path, reconnect_interval=0.05)
+        subscriber = UnixSocketBroker(path, reconnect_interval=0.05)
+        received = []
+        published_locally = []
+
+        async def on_message(channel, message):
+            received.append((channel, message))
+
+        async def on_local(channel, message):
+            published_locally.append((channel, message))
+
+        subscriber.subscribe("weather:*", on_message)
+        publisher.subscribe("weather:medellin", on_local)
+        await publisher.start()
+        await subscriber.start()
+        try:
+            await _wait_until(lambda: publisher.connected and subscriber.connected)
+            # Give the broker a moment to register the replayed subscriptions
+            await asyncio.sleep(0.1)
+            await publisher.publish("weather:bogota", {"type": "weather_update", "temperature": 18})
+            await _wait_until(lambda: received)
+        finally:
+            await publisher.stop()
+            await subscriber.stop()
+            server_task.cancel()
+            await asyncio.gather(server_task, return_exceptions=True)
+
+        assert received == [("weather:bogota", {"type": "weather_update", "temperature": 18})]
+        assert published_locally == []
+        assert publisher.local_fallbacks == 0
+        assert not os.path.exists(path)
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(os.path.join(directory, "broker.sock")))
+
+def test_publish_falls_back_to_local_delivery_without_a_broker():
+    async def scenario(path: str):
+        broker = UnixSocketBroker(path, reconnect_interval=0.05)
+        received = []
+
+        async def on_message(channel, message):
+            received.append((channel, message))
+
+        broker.subscribe("weather:*", on_message)
+        await broker.start()
+        try:
+            await broker.publish("weather:bogota", {"type": "weather_keepalive"})
+        finally:
+            await broker.stop()
+
+        assert received == [("weather:bogota", {"type": "weather_keepalive"})]
+        assert broker.local_fallbacks == 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(os.path.join(directory, "broker.sock")))
+
+def test_stale_broker_readings_are_not_cached_as_fresh():
+    from app.core.settings import settings
+    from app.models.weather import WeatherData, WeatherUpdate
+    from app.services.weather_cache import weather_cache
+    from app.services.websocket_manager import websocket_manager
+
+    city = next(iter(settings.CITIES))
+
+    def update(stale: bool) -> dict:
+        data = WeatherData(
+            city=city, name=settings.CITIES[city]["name"], temperature=20, humidity=60, description="Nublado",
+            time="10:00:00", emoji="☁️", source="Provider", real_data=not stale, stale=stale
+        )
+        return WeatherUpdate(type="weather_update", robot=f"robot_{city}", data=data, message="").dict()
+
+    async def scenario():
+        weather_cache.invalidate(city)
+        await websocket_manager.on_weather_message(f"weather:{city}", update(stale=True))
+        assert weather_cache.get_last(city) is None
+
+        await websocket_manager.on_weather_message(f"weather:{city}", update(stale=False))
+        assert weather_cache.get(city) is not None
+        weather_cache.invalidate(city)
+
+    asyncio.run(scenario())
+
+def test_malformed_frame_does_not_stop_the_subscriber():
+    from app.services.broker.protocol import PUBLISH, pack_frame
+
+    async def scenario(path: str):
+        server_task = asyncio.create_task(BrokerServer(path, max_buffer=1024 * 1024).serve())
+        await _wait_until(lambda: os.path.exists(path))
+
+        subscriber = UnixSocketBroker(path, reconnect_interval=0.05)
+        received = []
+
+        async def on_message(channel, message):
+            received.append((channel, message))
+
+        subscriber.subscribe("weather:*", on_message)
+        await subscriber.start()
+        _, writer = await asyncio.open_unix_connection(path)
+        try:
+            await _wait_until(lambda: subscriber.connected)
+            await asyncio.sleep(0.1)
+            writer.write(pack_frame(PUBLISH, "weather:bogota", b"{not json"))
+            writer.write(pack_frame(PUBLISH, "weather:bogota", b'{"type":"weather_keepalive"}'))
+            await writer.drain()
+            await _wait_until(lambda: received)
+        finally:
+            writer.close()
+            await subscriber.stop()
+            server_task.cancel()
+            await asyncio.gather(server_task, return_exceptions=True)
+
+        assert received == [("weather:bogota", {"type": "weather_keepalive"})]
+        assert subscriber.malformed == 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(os.path.join(directory, "broker.sock")))
@@ -0,0 +1,42 @@
+"""
+Chat intent routing
+"""
+import asyncio
+import pytest
+from app.core.settings import settings
+from app.services.chat_service import ChatService
+from app.services.simulation import synthetic_engine
+from app.services.weather_service import WeatherService
+
+@pytest.fixture
+def forecasts(monkeypatch):
+    """Serve simulated forecasts without touching the providers"""
+    async def get_forecast(city):
+        return synthetic_engine.forecast(city, settings.CITIES[city], "Datos simulados")
+    monkeypatch.setattr(WeatherService, "get_forecast", staticmethod(get_forecast))
+
+@pytest.mark.parametrize("message", ["pronóstico del clima en Bogotá", "temperatura mañana en Bogotá"])
+def test_forecast_questions_win_over_weather_keywords(forecasts, message):
+    response = asyncio.run(ChatService.handle_chat_message(message))
+
+    assert response["message"].startswith("🔮 **PRONÓSTICO**")
+    assert "BOGOTÁ" in response["message"]
+
+def test_forecast_without_a_resolvable_city_asks_which_city(monkeypatch):
+    async def get_forecast(city):
+        return None
+    monkeypatch.setattr(WeatherService, "get_forecast", staticmethod(get_forecast))
+
+    response = asyncio.run(ChatService.handle_chat_message("pronóstico"))
+
+    assert response["message"].startswith("📍 ¿De qué ciudad quieres el pronóstico?")
+
+@pytest.mark.parametrize("message, expected", [
+    ("clima cerca de 4.65, -74.05", (4.65, -74.05)),
+    ("coordenadas 6.25, -75.56", (6.25, -75.56)),
+    ("estación más cercana a 4.6, -74.1", (4.6, -74.1)),
+    ("suma 2.5, 3.5", None),
+    ("cuánto es 10.5, 20.25", None),
+])
+def test_coordinates_need_location_context(message, expected):
+    assert ChatService._find_coordinates(message) == expected
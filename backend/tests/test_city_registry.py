@@ -0,0 +1,90 @@
+"""
+City registry validation and the /cities endpoints
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.routes import router
+from app.core.settings import settings
+from app.services.city_registry import city_registry
+from app.services.simulation import register_synthetic_cities
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """The global registry writing to a temporary file, with settings restored afterwards"""
+    monkeypatch.setattr(city_registry, "path", str(tmp_path / "cities.json"))
+    cities = {city: dict(info) for city, info in settings.CITIES.items()}
+    intervals = dict(settings.ROBOT_INTERVALS)
+    city_registry._names = None
+    yield city_registry
+    settings.CITIES.clear()
+    settings.CITIES.update(cities)
+    settings.ROBOT_INTERVALS.clear()
+    settings.ROBOT_INTERVALS.update(intervals)
+    city_registry._names = None
+
+@pytest.fixture
+def client(registry):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def test_update_with_null_coordinate_keeps_the_current_value(client):
+    city = next(iter(settings.CITIES))
+    lat = settings.CITIES[city]["lat"]
+
+    response = client.put(f"/cities/{city}", json={"lat": None, "name": "Renamed"})
+
+    assert response.status_code == 200
+    assert response.json()["lat"] == lat
+    assert response.json()["name"] == "Renamed"
+
+def test_non_numeric_coordinates_are_rejected(registry):
+    city = next(iter(settings.CITIES))
+
+    with pytest.raises(ValueError, match="Coordinates must be numbers"):
+        registry.update(city, {"lat": "north"})
+    with pytest.raises(ValueError, match="Coordinates must be numbers"):
+        registry.add("villa_nueva", {"name": "Villa Nueva", "lat": None, "lon": -74.0})
+
+def test_out_of_range_coordinates_return_400(client):
+    city = next(iter(settings.CITIES))
+
+    response = client.put(f"/cities/{city}", json={"lat": 120})
+
+    assert response.status_code == 400
+
+def test_managed_cities_follow_runtime_changes(registry, monkeypatch):
+    monkeypatch.setattr(settings, "SIMULATION_CITY_COUNT", 3)
+    register_synthetic_cities()
+
+    assert not any(city.startswith("station_") for city in registry.managed)
+
+    registry.add("villa_nueva", {"name": "Villa Nueva", "lat": 4.5, "lon": -74.0})
+    assert "villa_nueva" in registry.managed
+    assert registry.find_in_text("clima en villa nueva") == ["villa_nueva"]
+
+    registry.remove("villa_nueva")
+    assert "villa_nueva" not in registry.managed
+
+def test_generated_station_keys_are_reserved(registry):
+    with pytest.raises(ValueError, match="reserved"):
+        registry.add("station_99999", {"name": "Fake", "lat": 4.5, "lon": -74.0})
+
+def test_corrupt_registry_file_falls_back_to_current_cities(registry):
+    cities = dict(settings.CITIES)
+    with open(registry.path, "w", encoding="utf-8") as registry_file:
+        registry_file.write('{"cities": {"bogota": ')
+
+    registry.load()
+
+    assert settings.CITIES == cities
+
+def test_invalid_registry_entries_are_skipped(registry):
+    with open(registry.path, "w", encoding="utf-8") as registry_file:
+        registry_file.write('{"cities": {"villa_nueva": {"name": "Villa Nueva", "lat": 4.5, "lon": -74.0}, "broken": {"name": "Broken"}}}')
+
+    registry.load()
+
+    assert "villa_nueva" in settings.CITIES
+    assert "broken" not in settings.CITIES
@@ -0,0 +1,90 @@
+"""
+Fallback readings when every weather provider is failing
+"""
+import asyncio
+from app.core.settings import settings
+from app.models.weather import WeatherData
+from app.services.providers.base import ProviderError
+from app.services.providers.registry import provider_registry
+from app.services.weather_cache import weather_cache
+from app.services.weather_service import WeatherService
+
+def test_cold_start_outage_serves_stale_simulated_data_until_the_provider_recovers(monkeypatch):
+    city = next(iter(settings.CITIES))
+    real = WeatherData(
+        city=city, name=settings.CITIES[city]["name"], temperature=17, humidity=70,
+        description="Nublado", time="10:00:00", emoji="☁️", source="Provider", real_data=True
+    )
+    provider_down = True
+
+    async def fetch_hedged(providers, call, priority, cost=None):
+        if provider_down:
+            raise ProviderError("provider unavailable")
+        return real
+
+    monkeypatch.setattr(provider_registry, "get_active", lambda: ["provider"])
+    monkeypatch.setattr(provider_registry, "seconds_until_retry", lambda: 0.0)
+    monkeypatch.setattr(WeatherService, "_fetch_hedged", staticmethod(fetch_hedged))
+
+    async def scenario():
+        nonlocal provider_down
+        weather_cache.invalidate(city)
+
+        fallback = await WeatherService.get_weather_data(city)
+        assert fallback.stale and not fallback.real_data
+        # The simulated reading is served but not cached as fresh
+        assert weather_cache.get(city) is None
+        revalidation = weather_cache._revalidations[city]
+
+        provider_down = False
+        await asyncio.wait_for(revalidation, timeout=5)
+
+        assert weather_cache.get(city) == real
+        assert await WeatherService.get_weather_data(city) == real
+        weather_cache.invalidate(city)
+
+    asyncio.run(scenario())
+
+def test_forecast_outage_serves_stale_simulated_forecast_without_storing_it(monkeypatch):
+    from app.services.forecast_store import forecast_store
+
+    city = next(iter(settings.CITIES))
+    calls = 0
+
+    async def fetch_hedged(providers, call, priority, cost=None):
+        nonlocal calls
+        calls += 1
+        raise ProviderError("provider unavailable")
+
+    monkeypatch.setattr(provider_registry, "get_active", lambda: ["provider"])
+    monkeypatch.setattr(WeatherService, "_fetch_hedged", staticmethod(fetch_hedged))
+
+    async def scenario():
+        forecast_store.invalidate(city)
+
+        forecast = await WeatherService.get_forecast(city)
+        assert forecast.stale and forecast.source == "Datos simulados"
+        assert forecast_store.get_last(city) is None
+
+        await WeatherService.get_forecast(city)
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+def test_robot_batch_outage_does_not_start_per_city_revalidation(monkeypatch):
+    cities = list(settings.CITIES)
+
+    async def fetch_hedged(providers, call, priority, cost=None):
+        raise ProviderError("provider unavailable")
+
+    monkeypatch.setattr(provider_registry, "get_active", lambda: ["provider"])
+    monkeypatch.setattr(WeatherService, "_fetch_hedged", staticmethod(fetch_hedged))
+
+    async def scenario():
+        readings = await WeatherService.refresh_weather_data_batch(cities)
+
+        assert set(readings) == set(cities)
+        assert all(weather.stale for weather in readings.values())
+        assert not any(city in weather_cache._revalidations for city in cities)
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+"""
+Restoring the weather cache from the on-disk snapshot
+"""
+import json
+import time
+from app.core.settings import settings
+from app.services.weather_cache import weather_cache
+from app.services.weather_snapshot import SNAPSHOT_FIELDS, SNAPSHOT_VERSION, WeatherSnapshot
+
+def test_restored_readings_are_expired_and_malformed_rows_are_skipped(tmp_path):
+    good, bad = list(settings.CITIES)[:2]
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time() - 60,
+        "fields": SNAPSHOT_FIELDS,
+        "cities": {
+            good: [18, 70, "Nublado", "10:00:00", "Provider", True],
+            bad: [18]
+        }
+    }))
+    for city in (good, bad):
+        weather_cache.invalidate(city)
+
+    snapshot = WeatherSnapshot(path=str(path), interval=0)
+    try:
+        assert snapshot.load() == 1
+        # Served only as a fallback: the first read is a miss and refetches
+        assert weather_cache.get(good) is None
+        restored = weather_cache.get_last(good)
+        assert restored.stale and restored.temperature == 18
+        assert weather_cache.get_last(bad) is None
+    finally:
+        for city in (good, bad):
+            weather_cache.invalidate(city)
+
+def test_malformed_snapshot_does_not_stop_startup(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps({"version": SNAPSHOT_VERSION, "saved_at": time.time()}))
+
+    assert WeatherSnapshot(path=str(path), interval=0).load() == 0
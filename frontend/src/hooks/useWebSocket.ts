@@ -46,23 +46,41 @@ export const useWebSocket = ({ onNotification, onSystemMessage }: UseWebSocketPr
         addMessage('Sistema', '✅ Conectado como Observer - Recibirás datos automáticos', "system");
       };
 
+      const handleServerMessage = (data: any, raw: string) => {
+        if (data.type === 'weather_update') {
+          // Robot weather data from server
+          onNotification?.(`📡 ${data.robot}: ${data.data.temperature}°C`, 'info');
+          addMessage('Robot', data.message, "robot");
+        } else if (data.type === 'weather_snapshot') {
+          // Latest reading of every city, sent once on connect
+          data.data.forEach((weather: any) => {
+            addMessage('Robot', `${weather.emoji} Robot ${weather.name}: ${weather.temperature}°C, ${weather.description} - ${weather.time} (${weather.source})`, "robot");
+          });
+        } else if (data.type === 'weather_keepalive') {
+          // Robot reading unchanged since its last update - nothing new to show
+        } else if (data.type === 'subscribed') {
+          // Acknowledgement of a city subscription change
+        } else if (data.type === 'chat_response') {
+          // Chat response from server - show in observer panel
+          addMessage('Chat Bot', data.message, "system");
+        } else if (data.type === 'connection') {
+          // Connection message
+          addMessage('Sistema', data.message, "system");
+        } else {
+          // Fallback for string messages
+          addMessage('Servidor', data.message || raw, "robot");
+        }
+      };
+
       observerWs.current.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
           
-          if (data.type === 'weather_update') {
-            // Robot weather data from server
-            onNotification?.(`📡 ${data.robot}: ${data.data.temperature}°C`, 'info');
-            addMessage('Robot', data.message, "robot");
-          } else if (data.type === 'chat_response') {
-            // Chat response from server - show in observer panel
-            addMessage('Chat Bot', data.message, "system");
-          } else if (data.type === 'connection') {
-            // Connection message
-            addMessage('Sistema', data.message, "system");
+          if (data.type === 'weather_batch') {
+            // City updates merged by the server's flush window
+            data.updates.forEach((update: any) => handleServerMessage(update, event.data));
           } else {
-            // Fallback for string messages
-            addMessage('Servidor', data.message || event.data, "robot");
+            handleServerMessage(data, event.data);
           }
         } catch (error) {
           // Handle non-JSON messages